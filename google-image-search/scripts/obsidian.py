@@ -5,6 +5,17 @@ import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    import orjson
+
+    def _load_json_file(path: Path) -> Any:
+        return orjson.loads(path.read_bytes())
+except ImportError:
+    def _load_json_file(path: Path) -> Any:
+        return json.loads(path.read_text(encoding="utf-8"))
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+)$")
+
 
 def detect_obsidian_vault(path: Path) -> Optional[Path]:
     """Check if path is in an Obsidian vault, return vault root."""
@@ -26,11 +37,11 @@ def get_attachments_folder(vault_root: Path, default: str = "Attachments") -> Pa
 
     if app_json.exists():
         try:
-            settings = json.loads(app_json.read_text(encoding="utf-8"))
+            settings = _load_json_file(app_json)
             attachment_path = settings.get("attachmentFolderPath", default)
             if attachment_path:
                 return vault_root / attachment_path
-        except (json.JSONDecodeError, KeyError):
+        except (ValueError, KeyError):  # JSONDecodeError subclasses ValueError
             pass
 
     return vault_root / default
@@ -45,7 +56,10 @@ def extract_headings(note_content: str) -> List[Tuple[str, int, int]]:
     lines = note_content.split("\n")
 
     for line_num, line in enumerate(lines):
-        match = re.match(r"^(#{1,6})\s+(.+)$", line)
+        # Most lines are not headings; skip them before touching the regex
+        if not line or line[0] != "#":
+            continue
+        match = _HEADING_RE.match(line)
         if match:
             level = len(match.group(1))
             text = match.group(2).strip()
@@ -59,30 +73,41 @@ def extract_frontmatter(note_content: str) -> Tuple[Optional[Dict], str]:
 
     Returns: (frontmatter_dict or None, content_without_frontmatter)
     """
-    if not note_content.startswith("---"):
+    # Frontmatter must open with a bare "---" line; a 4-char slice rejects
+    # ordinary notes without scanning or splitting the body.
+    if note_content[:4] not in ("---\n", "---\r"):
         return None, note_content
 
-    lines = note_content.split("\n")
-    end_idx = None
-    for i, line in enumerate(lines[1:], start=1):
-        if line.strip() == "---":
-            end_idx = i
-            break
-
-    if end_idx is None:
+    # Locate the closing "---" line with str.find instead of splitting the
+    # whole note; only the frontmatter block itself is split into lines.
+    fm_start = note_content.find("\n") + 1
+    if not fm_start:
         return None, note_content
 
-    frontmatter_lines = lines[1:end_idx]
-    content_lines = lines[end_idx + 1:]
+    # The closing line is any line that strips to "---" (indentation and
+    # trailing whitespace allowed), so check the line around each "---".
+    search_pos = fm_start
+    while True:
+        dashes = note_content.find("---", search_pos)
+        if dashes < 0:
+            return None, note_content
+        line_start = note_content.rfind("\n", 0, dashes) + 1
+        line_end = note_content.find("\n", dashes)
+        if line_end < 0:
+            line_end = len(note_content)
+        if note_content[line_start:line_end].strip() == "---":
+            break
+        search_pos = line_end
+    end = line_start - 1
 
     # Simple YAML parsing (key: value)
     frontmatter = {}
-    for line in frontmatter_lines:
+    for line in note_content[fm_start:end].split("\n"):
         if ":" in line:
             key, _, value = line.partition(":")
             frontmatter[key.strip()] = value.strip()
 
-    return frontmatter, "\n".join(content_lines)
+    return frontmatter, note_content[line_end + 1:]
 
 
 def find_heading_line(note_content: str, heading_text: str) -> Optional[int]:
@@ -132,10 +157,38 @@ def insert_images_below_headings(
         note_content: The note content
         images: Dict mapping heading text to image embed string
     """
+    lines = note_content.split("\n")
+    heading_lines: Dict[str, int] = {}
+    for text, _, line_num in extract_headings(note_content):
+        heading_lines.setdefault(text.lower(), line_num)
+
+    # Collect the lines to insert at each position of the original note, then
+    # splice them in bottom-up so earlier indices stay valid and the note is
+    # joined only once. Embeds landing on the same position keep the order
+    # repeated insert_image_after_heading calls would give them.
+    pending: Dict[int, List[str]] = {}
     for heading, embed in images.items():
-        note_content = insert_image_after_heading(note_content, heading, embed)
+        heading_line = heading_lines.get(heading.lower())
+        if heading_line is None:
+            # Heading not found, append at end
+            pending.setdefault(len(lines), []).extend(("", embed))
+            continue
 
-    return note_content
+        # Skip any empty lines right after heading
+        insert_pos = heading_line + 1
+        while insert_pos < len(lines) and not lines[insert_pos].strip():
+            insert_pos += 1
+
+        block = pending.setdefault(insert_pos, [])
+        block_pos = 0
+        while block_pos < len(block) and not block[block_pos].strip():
+            block_pos += 1
+        block[block_pos:block_pos] = ["", embed, ""]
+
+    for insert_pos in sorted(pending, reverse=True):
+        lines[insert_pos:insert_pos] = pending[insert_pos]
+
+    return "\n".join(lines)
 
 
 def format_obsidian_embed(
@@ -170,38 +223,56 @@ def format_standard_embed(
     return f"![{alt_text}]({path_or_url})"
 
 
-def find_best_heading_match(
+# Headings with more words than this use set intersection for overlap
+_LINEAR_OVERLAP_MAX_WORDS = 8
+
+
+def _prepare_headings(headings: List[str]) -> List[Tuple[str, str, List[str]]]:
+    """Lowercase and tokenize headings once for repeated matching."""
+    prepared = []
+    for h in headings:
+        h_lower = h.lower()
+        prepared.append((h, h_lower, h_lower.split()))
+    return prepared
+
+
+def _match_prepared_heading(
     target: str,
-    headings: List[str],
+    prepared: List[Tuple[str, str, List[str]]],
 ) -> Optional[str]:
-    """Find best matching heading using partial matching."""
-    if not target or not headings:
+    """Match target against headings already processed by _prepare_headings."""
+    if not target or not prepared:
         return None
 
     target_lower = target.lower()
 
     # Try exact match first
-    for h in headings:
-        if h.lower() == target_lower:
+    for h, h_lower, _ in prepared:
+        if h_lower == target_lower:
             return h
 
     # Try if target is contained in heading (handles "1. AI Safety" matching "AI Safety")
-    for h in headings:
-        if target_lower in h.lower():
+    for h, h_lower, _ in prepared:
+        if target_lower in h_lower:
             return h
 
     # Try if heading is contained in target
-    for h in headings:
-        if h.lower() in target_lower:
+    for h, h_lower, _ in prepared:
+        if h_lower in target_lower:
             return h
 
-    # Try word overlap
-    target_words = set(target_lower.split())
+    # Try word overlap (distinct target words found in the heading)
+    target_words = list(dict.fromkeys(target_lower.split()))
+    target_set = None
     best_match = None
     best_overlap = 0
-    for h in headings:
-        h_words = set(h.lower().split())
-        overlap = len(target_words & h_words)
+    for h, _, h_words in prepared:
+        if len(h_words) > _LINEAR_OVERLAP_MAX_WORDS:
+            if target_set is None:
+                target_set = set(target_words)
+            overlap = len(target_set.intersection(h_words))
+        else:
+            overlap = sum(1 for w in target_words if w in h_words)
         if overlap > best_overlap:
             best_overlap = overlap
             best_match = h
@@ -212,6 +283,17 @@ def find_best_heading_match(
     return None
 
 
+def find_best_heading_match(
+    target: str,
+    headings: List[str],
+) -> Optional[str]:
+    """Find best matching heading using partial matching."""
+    if not target or not headings:
+        return None
+
+    return _match_prepared_heading(target, _prepare_headings(headings))
+
+
 def map_terms_to_headings(
     terms: List[Dict[str, Any]],
     headings: List[Tuple[str, int, int]],
@@ -221,13 +303,14 @@ def map_terms_to_headings(
     Returns: {heading_text: [term_entries]}
     """
     heading_texts = [h[0] for h in headings]
+    prepared = _prepare_headings(heading_texts)
     result: Dict[str, List[Dict[str, Any]]] = {}
 
     for term in terms:
         target_heading = term.get("heading")
 
         # Try fuzzy matching
-        matched_heading = find_best_heading_match(target_heading, heading_texts)
+        matched_heading = _match_prepared_heading(target_heading, prepared)
 
         if matched_heading:
             result.setdefault(matched_heading, []).append(term)
@@ -1,7 +1,9 @@
 """Markdown output generation for image search results."""
 
+import io
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Tuple
 
 
 def format_alt_text(text: str) -> str:
@@ -9,16 +11,28 @@ def format_alt_text(text: str) -> str:
     return text.replace("[", "(").replace("]", ")")
 
 
+def _scored_items(items: Iterable[Dict[str, Any]]) -> List[Tuple[float, Dict[str, Any]]]:
+    """Pair each item with its evaluation score so sorting looks it up only once."""
+    return [
+        ((item.get("evaluation") or {}).get("score", float("-inf")), item)
+        for item in items
+    ]
+
+
+_score_key = itemgetter(0)
+
+
 def emit_summary_markdown(results: Iterable[Dict[str, Any]]) -> str:
     """Generate summary markdown with links and metadata."""
-    lines: List[str] = []
+    buf = io.StringIO()
+    w = buf.write
     for bundle in results:
         entry = bundle["entry"]
         heading = entry.get("heading") or entry.get("id", "Unnamed")
         description = entry.get("description")
-        lines.append(f"### {heading}")
+        w(f"### {heading}\n")
         if description:
-            lines.append(description)
+            w(f"{description}\n")
         for item in bundle["results"]:
             link = item.get("link")
             title = item.get("title")
@@ -34,17 +48,17 @@ def emit_summary_markdown(results: Iterable[Dict[str, Any]]) -> str:
             if item.get("finalChoice"):
                 detail_parts.append("final")
             detail = ", ".join(detail_parts)
-            lines.append(f"- {title or 'Untitled'} ({detail})\n  {link}")
+            w(f"- {title or 'Untitled'} ({detail})\n  {link}\n")
             if context and context != link:
-                lines.append(f"  Source page: {context}")
+                w(f"  Source page: {context}\n")
             reasons = item.get("evaluation", {}).get("reasons")
             if reasons:
-                lines.append("  Reasons: " + "; ".join(reasons))
+                w(f"  Reasons: {'; '.join(reasons)}\n")
             final_reason = item.get("finalChoiceReason")
             if final_reason:
-                lines.append(f"  Final pick rationale: {final_reason}")
-        lines.append("")
-    return "\n".join(lines).rstrip() + "\n"
+                w(f"  Final pick rationale: {final_reason}\n")
+        w("\n")
+    return buf.getvalue().rstrip() + "\n"
 
 
 def emit_preview_markdown(
@@ -53,14 +67,15 @@ def emit_preview_markdown(
     prefer_local: bool = False,
 ) -> str:
     """Generate preview markdown with inline images."""
-    lines: List[str] = []
+    buf = io.StringIO()
+    w = buf.write
     for bundle in results:
         entry = bundle["entry"]
         heading = entry.get("heading") or entry.get("id", "Unnamed")
         description = entry.get("description")
-        lines.append(f"### {heading}")
+        w(f"### {heading}\n")
         if description:
-            lines.append(description)
+            w(f"{description}\n")
         for idx, item in enumerate(bundle["results"], start=1):
             raw_title = item.get("title") or f"Image {idx}"
             title = format_alt_text(raw_title)
@@ -72,96 +87,102 @@ def emit_preview_markdown(
             if not image_target:
                 continue
             source = item.get("contextLink") or item.get("link")
-            lines.append(f"![{title}]({image_target})")
+            w(f"![{title}]({image_target})\n")
             if source and source != image_target:
-                lines.append(f"[Source]({source})")
+                w(f"[Source]({source})\n")
             score = item.get("evaluation", {}).get("score")
             if score is not None:
-                lines.append(f"Score: {score}")
+                w(f"Score: {score}\n")
             reasons = item.get("evaluation", {}).get("reasons")
             if reasons:
-                lines.append("Reasons: " + "; ".join(reasons))
+                w(f"Reasons: {'; '.join(reasons)}\n")
             final_reason = item.get("finalChoiceReason")
             if final_reason:
-                lines.append(f"Final pick: {final_reason}")
-            lines.append("")
-        lines.append("")
-    return "\n".join(lines).rstrip() + "\n"
+                w(f"Final pick: {final_reason}\n")
+            w("\n")
+        w("\n")
+    return buf.getvalue().rstrip() + "\n"
 
 
 def emit_selection_markdown(results: Iterable[Dict[str, Any]]) -> str:
     """Generate markdown showing top-scoring selections."""
-    lines: List[str] = []
+    buf = io.StringIO()
+    w = buf.write
     for bundle in results:
         entry = bundle["entry"]
         heading = entry.get("heading") or entry.get("id", "Unnamed")
         criteria = entry.get("selectionCriteria")
         selection_count = entry.get("selectionCount", 1)
-        lines.append(f"### {heading}")
+        w(f"### {heading}\n")
         if criteria:
-            lines.append(f"Criteria: {criteria}")
-        sorted_items = sorted(
-            bundle["results"],
-            key=lambda item: item.get("evaluation", {}).get("score", float("-inf")),
-            reverse=True,
-        )
-        for idx, item in enumerate(sorted_items[:selection_count], start=1):
+            w(f"Criteria: {criteria}\n")
+        scored = _scored_items(bundle["results"])
+        if selection_count == 1:
+            best = max(scored, key=_score_key, default=None)
+            top_items = [best[1]] if best else []
+        else:
+            scored.sort(key=_score_key, reverse=True)
+            top_items = [item for _, item in scored[:selection_count]]
+        for idx, item in enumerate(top_items, start=1):
+            evaluation = item.get("evaluation") or {}
             title = item.get("title") or f"Image {idx}"
             link = item.get("link")
-            score = item.get("evaluation", {}).get("score")
-            lines.append(f"{idx}. {title} - score {score}")
-            lines.append(f"   Link: {link}")
+            score = evaluation.get("score")
+            w(f"{idx}. {title} - score {score}\n")
+            w(f"   Link: {link}\n")
             local_path = item.get("localPath")
             if local_path:
-                lines.append(f"   Local: {local_path}")
+                w(f"   Local: {local_path}\n")
             source = item.get("contextLink")
             if source and source != link:
-                lines.append(f"   Source: {source}")
-            reasons = item.get("evaluation", {}).get("reasons")
+                w(f"   Source: {source}\n")
+            reasons = evaluation.get("reasons")
             if reasons:
-                lines.append(f"   Reasons: {', '.join(reasons)}")
-        lines.append("")
-    return "\n".join(lines).rstrip() + "\n"
+                w(f"   Reasons: {', '.join(reasons)}\n")
+        w("\n")
+    return buf.getvalue().rstrip() + "\n"
 
 
 def emit_final_selection_markdown(results: Iterable[Dict[str, Any]]) -> str:
     """Generate markdown showing only final LLM-selected images."""
-    lines: List[str] = []
+    buf = io.StringIO()
+    w = buf.write
     for bundle in results:
         entry = bundle["entry"]
         heading = entry.get("heading") or entry.get("id", "Unnamed")
         criteria = entry.get("selectionCriteria") or entry.get("description")
-        lines.append(f"### {heading}")
+        w(f"### {heading}\n")
         if criteria:
-            lines.append(f"Criteria: {criteria}")
+            w(f"Criteria: {criteria}\n")
         selection = entry.get("finalSelection")
         if not selection:
-            lines.append("No final selection was made.")
-            lines.append("")
+            w("No final selection was made.\n")
+            w("\n")
             continue
         item = selection["item"]
         title = item.get("title") or "Untitled"
         link = item.get("link")
-        lines.append(f"Chosen image: {title}")
-        lines.append(f"Link: {link}")
+        w(f"Chosen image: {title}\n")
+        w(f"Link: {link}\n")
         local_path = item.get("localPath")
         if local_path:
-            lines.append(f"Local file: {local_path}")
+            w(f"Local file: {local_path}\n")
         source = item.get("contextLink")
         if source and source != link:
-            lines.append(f"Source page: {source}")
-        lines.append(f"LLM explanation: {selection['explanation']}")
-        lines.append("")
-    return "\n".join(lines).rstrip() + "\n"
+            w(f"Source page: {source}\n")
+        w(f"LLM explanation: {selection['explanation']}\n")
+        w("\n")
+    return buf.getvalue().rstrip() + "\n"
 
 
 def emit_urls_only(results: Iterable[Dict[str, Any]], best_only: bool = True) -> str:
     """Generate simple list of image URLs."""
-    lines: List[str] = []
+    buf = io.StringIO()
+    w = buf.write
     for bundle in results:
         entry = bundle["entry"]
         heading = entry.get("heading") or entry.get("id", "Unnamed")
-        lines.append(f"# {heading}")
+        w(f"# {heading}\n")
 
         if best_only:
             # Find final choice or top scored
@@ -171,20 +192,18 @@ def emit_urls_only(results: Iterable[Dict[str, Any]], best_only: bool = True) ->
                     best_item = item
                     break
             if not best_item and bundle["results"]:
-                sorted_items = sorted(
+                best_item = max(
                     bundle["results"],
-                    key=lambda x: x.get("evaluation", {}).get("score", float("-inf")),
-                    reverse=True,
+                    key=lambda x: (x.get("evaluation") or {}).get("score", float("-inf")),
                 )
-                best_item = sorted_items[0]
             if best_item:
-                lines.append(best_item.get("link", ""))
+                w(f"{best_item.get('link', '')}\n")
         else:
             for item in bundle["results"]:
-                lines.append(item.get("link", ""))
+                w(f"{item.get('link', '')}\n")
 
-        lines.append("")
-    return "\n".join(lines).rstrip() + "\n"
+        w("\n")
+    return buf.getvalue().rstrip() + "\n"
 
 
 def emit_obsidian_embed(
@@ -14,17 +14,41 @@ Usage:
 """
 
 import argparse
+import atexit
+import hashlib
 import json
+import os
+import queue
 import sqlite3
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache, wraps
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import uuid
 
+try:
+    import orjson
+
+    def _dump_json(data: Any) -> str:
+        return orjson.dumps(
+            data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+except ImportError:
+    def _dump_json(data: Any) -> str:
+        return json.dumps(data, indent=2, default=str)
+
 DB_PATH = Path.home() / "data" / "health.db"
+# daily_aggregates lives here, outside the user's database (see _ensure_daily_aggregates)
+AGGREGATES_CACHE_DIR = Path.home() / ".cache" / "health-data"
 
-# LOINC codes for FHIR output
-LOINC_CODES = {
+# LOINC codes for FHIR output (read-only)
+LOINC_CODES = MappingProxyType({sys.intern(k): v for k, v in {
     "HKQuantityTypeIdentifierHeartRate": ("8867-4", "Heart rate", "/min"),
     "HKQuantityTypeIdentifierHeartRateVariabilitySDNN": ("80404-7", "R-R interval.standard deviation", "ms"),
     "HKQuantityTypeIdentifierRestingHeartRate": ("40443-4", "Resting heart rate", "/min"),
@@ -36,9 +60,9 @@ LOINC_CODES = {
     "HKQuantityTypeIdentifierDistanceWalkingRunning": ("41953-1", "Walking distance", "km"),
     "HKQuantityTypeIdentifierFlightsClimbed": ("93831-6", "Flights of stairs climbed", "{flights}"),
     "HKQuantityTypeIdentifierVO2Max": ("60842-2", "VO2 max", "mL/min/kg"),
-}
+}.items()})
 
-FRIENDLY_NAMES = {
+FRIENDLY_NAMES = MappingProxyType({sys.intern(k): v for k, v in {
     "HKQuantityTypeIdentifierHeartRate": "Heart Rate",
     "HKQuantityTypeIdentifierHeartRateVariabilitySDNN": "HRV",
     "HKQuantityTypeIdentifierRestingHeartRate": "Resting HR",
@@ -52,14 +76,293 @@ FRIENDLY_NAMES = {
     "HKQuantityTypeIdentifierVO2Max": "VO2 Max",
     "HKQuantityTypeIdentifierRespiratoryRate": "Respiratory Rate",
     "HKQuantityTypeIdentifierBodyMass": "Weight",
+}.items()})
+
+
+# Lowercased (display, hk_type, entry) rows for partial-name LOINC matching
+_LOINC_SEARCH = tuple(
+    (display.lower(), hk_type.lower(), (code, display, ucum))
+    for hk_type, (code, display, ucum) in LOINC_CODES.items()
+)
+
+
+def _scan_loinc(name_lower: str) -> Optional[Tuple[str, str, str]]:
+    """First LOINC entry whose display or HK type contains the name"""
+    for display_lower, hk_lower, entry in _LOINC_SEARCH:
+        if name_lower in display_lower or name_lower in hk_lower:
+            return entry
+    return None
+
+
+# Exact lowercase display / HK type -> the entry the partial scan would pick
+_LOINC_BY_TOKEN = {
+    token: _scan_loinc(token)
+    for display_lower, hk_lower, _ in _LOINC_SEARCH
+    for token in (display_lower, hk_lower)
 }
 
 
+@lru_cache(maxsize=256)
+def _loinc_lookup(name: str) -> Optional[Tuple[str, str, str]]:
+    """(code, display, ucum) for a metric name, matched case-insensitively.
+
+    Metric names come from a small fixed set, so results are memoized.
+    """
+    name_lower = name.lower()
+    if name_lower in _LOINC_BY_TOKEN:
+        return _LOINC_BY_TOKEN[name_lower]
+    return _scan_loinc(name_lower)
+
+
+_CONN: Optional[sqlite3.Connection] = None
+_AGG_URI: Optional[str] = None  # how read-pool connections attach the aggregates
+_READ_POOL: "Optional[queue.Queue[sqlite3.Connection]]" = None
+READ_POOL_SIZE = 4
+
+RUN_QUERY_PAGE_SIZE = 1024
+
+
 def get_connection() -> sqlite3.Connection:
-    """Connect to health database"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Connect to health database (shared for the process).
+
+    The connection is opened once and reused by every query function so the
+    page cache stays warm between queries. Callers must not close it; it is
+    closed at interpreter exit.
+    """
+    global _CONN
+    if _CONN is None:
+        writable = os.access(DB_PATH, os.W_OK)
+        # Read-only file: open it read-only and leave it exactly as it is
+        conn = sqlite3.connect(
+            DB_PATH.as_uri() if writable else f"{DB_PATH.as_uri()}?mode=ro", uri=True,
+            check_same_thread=False, cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.executescript("""
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+            PRAGMA temp_store=MEMORY;
+        """)
+        if writable:
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.OperationalError:
+                pass  # e.g. the directory is read-only: keep the current journal mode
+            _ensure_schema(conn)
+        _ensure_daily_aggregates(conn)
+        # Everything after schema setup is read-only
+        conn.execute("PRAGMA query_only=1")
+        if os.environ.get("HEALTH_QUERY_DEBUG") == "1":
+            _enable_query_plan_trace(conn)
+        _CONN = conn
+    return _CONN
+
+
+def _enable_query_plan_trace(conn: sqlite3.Connection) -> None:
+    """Print EXPLAIN QUERY PLAN for every query to stderr (HEALTH_QUERY_DEBUG=1).
+
+    Use it to confirm queries are served by the indexes from _ensure_schema
+    ("SEARCH ... USING [COVERING] INDEX") rather than full "SCAN"s.
+    """
+    explaining = False
+
+    def trace(statement: str) -> None:
+        nonlocal explaining
+        if explaining or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return
+        explaining = True
+        try:
+            plan = conn.execute("EXPLAIN QUERY PLAN " + statement).fetchall()
+        except sqlite3.Error as e:
+            plan = [f"(no plan: {e})"]
+        finally:
+            explaining = False
+        print("EQP:", " ".join(statement.split())[:120], file=sys.stderr)
+        for step in plan:
+            print("    ", step[-1] if isinstance(step, sqlite3.Row) else step, file=sys.stderr)
+
+    conn.set_trace_callback(trace)
+
+
+def _read_pool() -> "queue.Queue[sqlite3.Connection]":
+    """Pool of read-only connections for running independent queries in parallel.
+
+    WAL mode lets these readers run alongside each other, and sqlite3 releases
+    the GIL while a statement executes.
+    """
+    global _READ_POOL
+    if _READ_POOL is None:
+        get_connection()  # schema and indexes must exist before opening read-only
+        pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(READ_POOL_SIZE):
+            conn = sqlite3.connect(
+                f"{DB_PATH.as_uri()}?mode=ro", uri=True,
+                check_same_thread=False, cached_statements=256,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.executescript("""
+                PRAGMA mmap_size=268435456;
+                PRAGMA cache_size=-16384;
+                PRAGMA temp_store=MEMORY;
+            """)
+            conn.execute("ATTACH DATABASE ? AS agg", (_AGG_URI,))
+            if os.environ.get("HEALTH_QUERY_DEBUG") == "1":
+                _enable_query_plan_trace(conn)
+            pool.put(conn)
+        _READ_POOL = pool
+    return _READ_POOL
+
+
+def _run_pooled(sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+    """Run a read query on a connection borrowed from the read pool"""
+    pool = _read_pool()
+    conn = pool.get()
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        pool.put(conn)
+
+
+def _run_parallel(jobs: List[Tuple[str, Tuple]]) -> List[List[sqlite3.Row]]:
+    """Run independent (sql, params) jobs concurrently; results keep job order"""
+    _read_pool()  # open the pool here so worker threads don't race to create it
+    with ThreadPoolExecutor(max_workers=min(len(jobs), READ_POOL_SIZE)) as ex:
+        futures = [ex.submit(_run_pooled, sql, params) for sql, params in jobs]
+        return [f.result() for f in futures]
+
+
+def _close_connection() -> None:
+    global _CONN, _READ_POOL
+    if _READ_POOL is not None:
+        while not _READ_POOL.empty():
+            _READ_POOL.get_nowait().close()
+        _READ_POOL = None
+    if _CONN is not None:
+        _CONN.close()
+        _CONN = None
+
+
+atexit.register(_close_connection)
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    """Add the indexes the built-in queries rely on.
+
+    One-time and idempotent: nothing is written once the schema is in place.
+    """
+    try:
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_records_type_date
+            ON health_records(record_type, start_date)
+        """)
+        # Covering index: per-type date-range aggregates never touch the table
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_records_type_date_value
+            ON health_records(record_type, start_date, value)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_workouts_start_date
+            ON workouts(start_date)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_activity_date
+            ON activity_summaries(date)
+        """)
+        # Covering index: per-night stage sums are read from the index alone
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sleep_start_stage_duration
+            ON sleep_sessions(start_date, sleep_stage, duration_minutes)
+        """)
+        conn.commit()
+    except sqlite3.OperationalError:
+        # Read-only database: queries still work, just slower
+        pass
+
+
+def _db_fingerprint() -> str:
+    """Identify the current contents of DB_PATH by file metadata.
+
+    Any write (insert, update, replace, delete, re-import) changes the mtime
+    or size of the database or its WAL file. An empty WAL carries no data,
+    so it is ignored.
+    """
+    st = os.stat(DB_PATH)
+    parts = [str(DB_PATH.resolve()), st.st_ino, st.st_mtime_ns, st.st_size]
+    try:
+        wal = os.stat(f"{DB_PATH}-wal")
+    except FileNotFoundError:
+        wal = None
+    if wal is not None and wal.st_size:
+        parts += [wal.st_mtime_ns, wal.st_size]
+    return json.dumps(parts)
+
+
+_BUILD_DAILY_AGGREGATES = """
+    DROP TABLE IF EXISTS agg.daily_aggregates;
+    CREATE TABLE agg.daily_aggregates (
+        date TEXT NOT NULL,
+        record_type TEXT NOT NULL,
+        source_is_watch INTEGER NOT NULL,
+        total REAL,
+        cnt INTEGER NOT NULL,
+        mn REAL,
+        mx REAL,
+        PRIMARY KEY (date, record_type, source_is_watch)
+    ) WITHOUT ROWID;
+    CREATE INDEX agg.idx_daily_aggregates_type_date
+        ON daily_aggregates(record_type, date);
+
+    INSERT INTO agg.daily_aggregates
+    SELECT substr(start_date, 1, 10), record_type,
+           IFNULL(source_name LIKE '%Watch%', 0),
+           SUM(value), COUNT(value), MIN(value), MAX(value)
+    FROM main.health_records
+    GROUP BY 1, 2, 3;
+"""
+
+
+def _ensure_daily_aggregates(conn: sqlite3.Connection) -> None:
+    """Attach the daily_aggregates summary as schema "agg", rebuilding it if stale.
+
+    One row per (day, record_type, source_is_watch) with SUM/COUNT/MIN/MAX of
+    value, so date-range totals read a few hundred rows instead of scanning
+    millions of samples. The table is kept in a cache database under
+    AGGREGATES_CACHE_DIR rather than in the user's health.db, and is rebuilt
+    from scratch whenever the health database has changed since the last
+    build (see _db_fingerprint); on a large database a rebuild takes a while.
+    If the cache cannot be written, the summary is built in memory for this
+    process instead.
+    """
+    global _AGG_URI
+    fingerprint = _db_fingerprint()
+    digest = hashlib.sha1(str(DB_PATH.resolve()).encode()).hexdigest()[:12]
+    cache_path = AGGREGATES_CACHE_DIR / f"daily_aggregates-{digest}.db"
+
+    attached = False
+    try:
+        AGGREGATES_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn.execute("ATTACH DATABASE ? AS agg", (cache_path.as_uri(),))
+        attached = True
+        conn.execute("CREATE TABLE IF NOT EXISTS agg.meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM agg.meta WHERE key = 'source'").fetchone()
+        if not row or row[0] != fingerprint:
+            conn.executescript("BEGIN IMMEDIATE;" + _BUILD_DAILY_AGGREGATES)
+            conn.execute("INSERT OR REPLACE INTO agg.meta VALUES ('source', ?)", (fingerprint,))
+            conn.commit()
+        _AGG_URI = f"{cache_path.as_uri()}?mode=ro"
+        return
+    except (OSError, sqlite3.OperationalError):
+        # Cache not writable (or locked by another build): fall back below
+        if conn.in_transaction:
+            conn.rollback()
+        if attached:
+            conn.execute("DETACH DATABASE agg")
+
+    # Shared in-memory database, so read-pool connections see it too
+    _AGG_URI = f"file:health-agg-{digest}?mode=memory&cache=shared"
+    conn.execute("ATTACH DATABASE ? AS agg", (_AGG_URI,))
+    conn.executescript("BEGIN;" + _BUILD_DAILY_AGGREGATES + "COMMIT;")
 
 
 # ============================================================
@@ -70,52 +373,239 @@ def get_connection() -> sqlite3.Connection:
 # iPhone and Apple Watch simultaneously, causing double-counting when
 # both sources are summed. Solution: filter to Apple Watch data only
 # using "source_name LIKE '%Watch%'" since Watch is more accurate for
-# movement tracking (always on wrist).
+# movement tracking (always on wrist). daily_aggregates stores that
+# expression per day as source_is_watch, so totals filter on
+# "source_is_watch = 1" instead of running the leading-wildcard LIKE per sample.
 #
 # Also: start_date has timezone offset ("+0100") that SQLite's DATE()
 # function doesn't handle, so we use substr(start_date, 1, 10) instead.
 #
+# ============================================================
+# SQL Builders
+# ============================================================
+
+def _daily_sum_sql(watch_only: bool = True) -> str:
+    """SQL for per-day totals of one record type over [start, end).
+
+    Parameters: (record_type, start_date, end_date). Reads the pre-summed
+    daily_aggregates table; the Watch deduplication filter runs in SQLite.
+    """
+    source_filter = "AND source_is_watch = 1" if watch_only else ""
+    return f"""
+        SELECT date AS day, SUM(total) AS total
+        FROM agg.daily_aggregates
+        WHERE record_type = ?
+        AND date >= ? AND date < ?
+        {source_filter}
+        GROUP BY day
+    """
+
+
+def _week_bucket_sql(day_expr: str) -> str:
+    """SQL expression for the 0-based week index of a YYYY-MM-DD day.
+
+    Takes one parameter: the first day of week 0.
+    """
+    return f"CAST((julianday({day_expr}) - julianday(?)) / 7 AS INTEGER)"
+
+
+# ============================================================
+# SQL Statements
+# ============================================================
+#
+# Every built-in query is a fixed string so repeated executions on the
+# shared connection hit sqlite3's prepared-statement cache instead of
+# being re-parsed and re-planned.
+
+SQL_DAILY_TOTALS = """
+        SELECT record_type,
+            SUM(CASE WHEN source_is_watch = 1
+                     OR record_type = 'HKQuantityTypeIdentifierAppleExerciseTime'
+                     THEN total END) as total
+        FROM agg.daily_aggregates
+        WHERE date = ?
+        AND record_type IN (
+            'HKQuantityTypeIdentifierStepCount',
+            'HKQuantityTypeIdentifierActiveEnergyBurned',
+            'HKQuantityTypeIdentifierAppleExerciseTime',
+            'HKQuantityTypeIdentifierDistanceWalkingRunning'
+        )
+        GROUP BY record_type
+"""
+
+SQL_DAILY_HEART_RATE = """
+        SELECT AVG(value) as avg, MIN(value) as min, MAX(value) as max
+        FROM health_records
+        WHERE record_type = 'HKQuantityTypeIdentifierHeartRate'
+        AND start_date >= ? AND start_date < ?
+        AND value BETWEEN 40 AND 200
+"""
+
+SQL_DAILY_ACTIVITY = """
+        SELECT * FROM activity_summaries WHERE date = ?
+"""
+
+SQL_WEEKLY_STEPS = f"""
+        SELECT {_week_bucket_sql("day")} AS wk, AVG(total) as avg
+        FROM ({_daily_sum_sql(watch_only=True)})
+        GROUP BY wk
+"""
+
+SQL_WEEKLY_RESTING_HR = f"""
+        SELECT {_week_bucket_sql("date")} AS wk, SUM(total) / SUM(cnt) as avg
+        FROM agg.daily_aggregates
+        WHERE record_type = 'HKQuantityTypeIdentifierRestingHeartRate'
+        AND date >= ? AND date < ?
+        GROUP BY wk
+"""
+
+SQL_WEEKLY_EXERCISE = f"""
+        SELECT {_week_bucket_sql("date")} AS wk, SUM(total) as total
+        FROM agg.daily_aggregates
+        WHERE record_type = 'HKQuantityTypeIdentifierAppleExerciseTime'
+        AND date >= ? AND date < ?
+        GROUP BY wk
+"""
+
+SQL_WEEKLY_WORKOUTS = f"""
+        SELECT {_week_bucket_sql("substr(start_date, 1, 10)")} AS wk, COUNT(*) as cnt
+        FROM workouts
+        WHERE start_date >= ? AND start_date < ?
+        GROUP BY wk
+"""
+
+SQL_SLEEP_STAGES = """
+        SELECT SUBSTR(start_date, 1, 10) as night, sleep_stage,
+               SUM(duration_minutes) as duration,
+               SUM(SUM(duration_minutes)) OVER (PARTITION BY SUBSTR(start_date, 1, 10)) as total
+        FROM sleep_sessions
+        WHERE start_date >= ?
+        GROUP BY night, sleep_stage
+        ORDER BY night DESC, sleep_stage
+"""
+
+SQL_SLEEP_AVG_NIGHT = """
+        SELECT AVG(total) as avg_minutes FROM (
+            SELECT SUM(duration_minutes) as total
+            FROM sleep_sessions
+            WHERE start_date >= ?
+            GROUP BY SUBSTR(start_date, 1, 10)
+        )
+"""
+
+VITAL_TYPES = (
+    "HKQuantityTypeIdentifierHeartRate",
+    "HKQuantityTypeIdentifierOxygenSaturation",
+    "HKQuantityTypeIdentifierRestingHeartRate",
+    "HKQuantityTypeIdentifierHeartRateVariabilitySDNN",
+    "HKQuantityTypeIdentifierRespiratoryRate",
+)
+_VITAL_TO_FRIENDLY = tuple((v, FRIENDLY_NAMES.get(v, v)) for v in VITAL_TYPES)
+
+# Latest reading for every vital in one statement. The correlated subquery
+# is a single backwards seek on (record_type, start_date) per type, unlike
+# GROUP BY + MAX(start_date) which would aggregate every reading.
+SQL_LATEST_VITALS = f"""
+        WITH vital_types(record_type) AS (
+            VALUES {", ".join("(?)" for _ in VITAL_TYPES)}
+        )
+        SELECT h.record_type, h.value, h.unit, h.start_date
+        FROM vital_types v
+        JOIN health_records h ON h.id = (
+            SELECT id FROM health_records
+            WHERE record_type = v.record_type
+            ORDER BY start_date DESC LIMIT 1
+        )
+"""
+
+# Ring percentages are computed by SQLite (same operand order as value /
+# goal * 100 in Python); they are NULL when a day has no goal set.
+SQL_ACTIVITY_RINGS = """
+        SELECT *,
+            CASE WHEN active_energy_goal > 0
+                 THEN CAST(active_energy_burned AS REAL) / active_energy_goal * 100 END as move_pct,
+            CASE WHEN exercise_time_goal > 0
+                 THEN CAST(exercise_time_minutes AS REAL) / exercise_time_goal * 100 END as exercise_pct,
+            CASE WHEN stand_hours_goal > 0
+                 THEN CAST(stand_hours AS REAL) / stand_hours_goal * 100 END as stand_pct
+        FROM activity_summaries
+        WHERE date >= ?
+        ORDER BY date DESC
+"""
+
+_WORKOUTS_SELECT = """
+        SELECT workout_type, duration_minutes, total_distance, distance_unit,
+               total_energy_burned, energy_unit, start_date, end_date, source_name
+        FROM workouts
+        WHERE start_date >= ?
+"""
+
+SQL_WORKOUTS = _WORKOUTS_SELECT + " ORDER BY start_date DESC"
+
+SQL_WORKOUTS_BY_TYPE = _WORKOUTS_SELECT + " AND workout_type LIKE ? ORDER BY start_date DESC"
+
+
 # ============================================================
 # Query Functions
 # ============================================================
 
+RESULT_CACHE_TTL = 60  # seconds
+
+
+def _ttl_cache(seconds: float = RESULT_CACHE_TTL):
+    """Memoize a query function's result per argument tuple for `seconds`.
+
+    Nothing in this module writes to the database, so a cached result only
+    goes stale through an external import; call `fn.cache_clear()` after one.
+    Results are shared between callers and must not be mutated.
+    """
+    def decorator(fn):
+        cache: Dict[Tuple, Tuple[float, Any]] = {}
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit is not None and now - hit[0] < seconds:
+                return hit[1]
+            result = fn(*args, **kwargs)
+            cache[key] = (now, result)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+@_ttl_cache()
 def daily_summary(date: str = None) -> Dict[str, Any]:
     """Get daily health summary"""
     if not date:
         date = datetime.now().strftime("%Y-%m-%d")
 
     conn = get_connection()
+    # Half-open [date, next_date) range instead of LIKE 'date%' so SQLite
+    # can range-scan the (record_type, start_date) indexes
+    next_date = (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    day_range = (date, next_date)
 
     result = {"date": date, "metrics": {}}
 
-    # Steps (deduplicated - Apple Watch source only to avoid iPhone double-counting)
-    cursor = conn.execute("""
-        SELECT SUM(value) as total FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierStepCount'
-        AND start_date LIKE ?
-        AND source_name LIKE '%Watch%'
-    """, (f"{date}%",))
-    row = cursor.fetchone()
-    result["metrics"]["steps"] = int(row["total"]) if row["total"] else 0
-
-    # Active calories (deduplicated - Apple Watch source only)
-    cursor = conn.execute("""
-        SELECT SUM(value) as total FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierActiveEnergyBurned'
-        AND start_date LIKE ?
-        AND source_name LIKE '%Watch%'
-    """, (f"{date}%",))
-    row = cursor.fetchone()
-    result["metrics"]["active_calories"] = round(row["total"], 1) if row["total"] else 0
+    # Per-type day totals from daily_aggregates: deduplicated (Apple Watch
+    # source only to avoid iPhone double-counting), except exercise minutes
+    # which sum every source
+    cursor = conn.execute(SQL_DAILY_TOTALS, (date,))
+    totals = {row["record_type"]: row["total"] for row in cursor}
 
-    # Heart rate avg/min/max
-    cursor = conn.execute("""
-        SELECT AVG(value) as avg, MIN(value) as min, MAX(value) as max
-        FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierHeartRate'
-        AND start_date LIKE ?
-        AND value BETWEEN 40 AND 200
-    """, (f"{date}%",))
+    total = totals.get("HKQuantityTypeIdentifierStepCount")
+    result["metrics"]["steps"] = int(total) if total else 0
+
+    total = totals.get("HKQuantityTypeIdentifierActiveEnergyBurned")
+    result["metrics"]["active_calories"] = round(total, 1) if total else 0
+
+    # Heart rate avg/min/max (raw samples: the 40-200 bpm filter is per reading)
+    cursor = conn.execute(SQL_DAILY_HEART_RATE, day_range)
     row = cursor.fetchone()
     result["metrics"]["heart_rate"] = {
         "avg": round(row["avg"], 1) if row["avg"] else None,
@@ -123,29 +613,14 @@ def daily_summary(date: str = None) -> Dict[str, Any]:
         "max": int(row["max"]) if row["max"] else None,
     }
 
-    # Exercise minutes
-    cursor = conn.execute("""
-        SELECT SUM(value) as total FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierAppleExerciseTime'
-        AND start_date LIKE ?
-    """, (f"{date}%",))
-    row = cursor.fetchone()
-    result["metrics"]["exercise_minutes"] = int(row["total"]) if row["total"] else 0
-
-    # Distance (deduplicated - Apple Watch source only)
-    cursor = conn.execute("""
-        SELECT SUM(value) as total FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierDistanceWalkingRunning'
-        AND start_date LIKE ?
-        AND source_name LIKE '%Watch%'
-    """, (f"{date}%",))
-    row = cursor.fetchone()
-    result["metrics"]["distance_km"] = round(row["total"], 2) if row["total"] else 0
+    total = totals.get("HKQuantityTypeIdentifierAppleExerciseTime")
+    result["metrics"]["exercise_minutes"] = int(total) if total else 0
+
+    total = totals.get("HKQuantityTypeIdentifierDistanceWalkingRunning")
+    result["metrics"]["distance_km"] = round(total, 2) if total else 0
 
     # Activity ring data
-    cursor = conn.execute("""
-        SELECT * FROM activity_summaries WHERE date = ?
-    """, (date,))
+    cursor = conn.execute(SQL_DAILY_ACTIVITY, (date,))
     row = cursor.fetchone()
     if row:
         result["activity_rings"] = {
@@ -153,73 +628,60 @@ def daily_summary(date: str = None) -> Dict[str, Any]:
             "exercise": {"value": row["exercise_time_minutes"], "goal": row["exercise_time_goal"]},
             "stand": {"value": row["stand_hours"], "goal": row["stand_hours_goal"]},
         }
-
-    conn.close()
     return result
 
 
+@_ttl_cache()
 def weekly_trends(weeks: int = 4) -> Dict[str, Any]:
     """Get weekly trends for key metrics"""
-    conn = get_connection()
     end_date = datetime.now()
     start_date = end_date - timedelta(weeks=weeks)
 
     result = {"period": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}", "weeks": []}
 
-    for w in range(weeks):
-        week_start = end_date - timedelta(weeks=weeks - w)
-        week_end = week_start + timedelta(days=7)
-
-        week_data = {
-            "week_of": week_start.strftime("%Y-%m-%d"),
-            "metrics": {}
-        }
+    # Week w covers [first_week + 7w days, first_week + 7(w+1) days). Each
+    # metric is fetched with one query bucketed by week instead of one query
+    # per metric per week.
+    week_starts = [end_date - timedelta(weeks=weeks - w) for w in range(weeks)]
+    result["weeks"] = [
+        {"week_of": week_start.strftime("%Y-%m-%d"), "metrics": {}}
+        for week_start in week_starts
+    ]
+    if not weeks:
+        return result
+    range_start = week_starts[0].strftime("%Y-%m-%d")
+    range_end = (week_starts[-1] + timedelta(days=7)).strftime("%Y-%m-%d")
+
+    # The four metric queries are independent, so they run concurrently on
+    # pooled read-only connections:
+    # - average daily steps (deduplicated - Apple Watch source only)
+    # - average resting heart rate
+    # - total exercise minutes
+    # - workout count
+    # Note: Using substr(start_date,1,10) instead of DATE() because
+    # start_date has timezone offset (+0100) that DATE() doesn't handle
+    bounds = (range_start, range_start, range_end)
+    step_rows, hr_rows, exercise_rows, workout_rows = _run_parallel([
+        (SQL_WEEKLY_STEPS, (range_start, "HKQuantityTypeIdentifierStepCount", range_start, range_end)),
+        (SQL_WEEKLY_RESTING_HR, bounds),
+        (SQL_WEEKLY_EXERCISE, bounds),
+        (SQL_WEEKLY_WORKOUTS, bounds),
+    ])
+    steps = {row["wk"]: row["avg"] for row in step_rows}
+    resting_hr = {row["wk"]: row["avg"] for row in hr_rows}
+    exercise = {row["wk"]: row["total"] for row in exercise_rows}
+    workouts = {row["wk"]: row["cnt"] for row in workout_rows}
+
+    for wk, week_data in enumerate(result["weeks"]):
+        metrics = week_data["metrics"]
+        avg_steps = steps.get(wk)
+        avg_hr = resting_hr.get(wk)
+        total_ex = exercise.get(wk)
+        metrics["avg_daily_steps"] = int(avg_steps) if avg_steps else 0
+        metrics["avg_resting_hr"] = round(avg_hr, 1) if avg_hr else None
+        metrics["total_exercise_min"] = int(total_ex) if total_ex else 0
+        metrics["workouts"] = workouts.get(wk, 0)
 
-        # Average daily steps (deduplicated - Apple Watch source only)
-        # Note: Using substr(start_date,1,10) instead of DATE() because
-        # start_date has timezone offset (+0100) that DATE() doesn't handle
-        cursor = conn.execute("""
-            SELECT AVG(daily_steps) as avg FROM (
-                SELECT substr(start_date, 1, 10) as day, SUM(value) as daily_steps
-                FROM health_records
-                WHERE record_type = 'HKQuantityTypeIdentifierStepCount'
-                AND start_date >= ? AND start_date < ?
-                AND source_name LIKE '%Watch%'
-                GROUP BY day
-            )
-        """, (week_start.strftime("%Y-%m-%d"), week_end.strftime("%Y-%m-%d")))
-        row = cursor.fetchone()
-        week_data["metrics"]["avg_daily_steps"] = int(row["avg"]) if row["avg"] else 0
-
-        # Average resting heart rate
-        cursor = conn.execute("""
-            SELECT AVG(value) as avg FROM health_records
-            WHERE record_type = 'HKQuantityTypeIdentifierRestingHeartRate'
-            AND start_date >= ? AND start_date < ?
-        """, (week_start.strftime("%Y-%m-%d"), week_end.strftime("%Y-%m-%d")))
-        row = cursor.fetchone()
-        week_data["metrics"]["avg_resting_hr"] = round(row["avg"], 1) if row["avg"] else None
-
-        # Total exercise minutes
-        cursor = conn.execute("""
-            SELECT SUM(value) as total FROM health_records
-            WHERE record_type = 'HKQuantityTypeIdentifierAppleExerciseTime'
-            AND start_date >= ? AND start_date < ?
-        """, (week_start.strftime("%Y-%m-%d"), week_end.strftime("%Y-%m-%d")))
-        row = cursor.fetchone()
-        week_data["metrics"]["total_exercise_min"] = int(row["total"]) if row["total"] else 0
-
-        # Workout count
-        cursor = conn.execute("""
-            SELECT COUNT(*) as cnt FROM workouts
-            WHERE start_date >= ? AND start_date < ?
-        """, (week_start.strftime("%Y-%m-%d"), week_end.strftime("%Y-%m-%d")))
-        row = cursor.fetchone()
-        week_data["metrics"]["workouts"] = row["cnt"]
-
-        result["weeks"].append(week_data)
-
-    conn.close()
     return result
 
 
@@ -231,86 +693,71 @@ def sleep_analysis(days: int = 7) -> Dict[str, Any]:
     result = {"period_days": days, "nights": [], "summary": {}}
 
     # Get sleep sessions grouped by night
-    cursor = conn.execute("""
-        SELECT SUBSTR(start_date, 1, 10) as night, sleep_stage, SUM(duration_minutes) as duration
-        FROM sleep_sessions
-        WHERE start_date >= ?
-        GROUP BY night, sleep_stage
-        ORDER BY night DESC
-    """, (start_date,))
+    cursor = conn.execute(SQL_SLEEP_STAGES, (start_date,))
 
+    # Per-night totals come from the window aggregate, so each night is
+    # complete as soon as its first row arrives
     nights = {}
     for row in cursor:
         night = row["night"]
-        if night not in nights:
-            nights[night] = {"date": night, "stages": {}}
-        nights[night]["stages"][row["sleep_stage"]] = round(row["duration"], 1)
-
-    # Calculate totals per night
-    for night, data in nights.items():
-        total = sum(data["stages"].values())
-        data["total_minutes"] = round(total, 1)
-        data["total_hours"] = round(total / 60, 1)
+        data = nights.get(night)
+        if data is None:
+            total = row["total"]
+            data = nights[night] = {
+                "date": night,
+                "stages": {},
+                "total_minutes": round(total, 1),
+                "total_hours": round(total / 60, 1),
+            }
+        data["stages"][row["sleep_stage"]] = round(row["duration"], 1)
 
     result["nights"] = list(nights.values())
 
     # Summary stats
     if nights:
-        all_totals = [n["total_minutes"] for n in nights.values()]
+        row = conn.execute(SQL_SLEEP_AVG_NIGHT, (start_date,)).fetchone()
         result["summary"] = {
-            "avg_sleep_hours": round(sum(all_totals) / len(all_totals) / 60, 1),
+            "avg_sleep_hours": round(row["avg_minutes"] / 60, 1),
             "nights_tracked": len(nights),
         }
-
-    conn.close()
     return result
 
 
+@_ttl_cache()
 def latest_vitals() -> Dict[str, Any]:
     """Get most recent vital readings"""
     conn = get_connection()
 
-    vitals = ["HKQuantityTypeIdentifierHeartRate", "HKQuantityTypeIdentifierOxygenSaturation",
-              "HKQuantityTypeIdentifierRestingHeartRate", "HKQuantityTypeIdentifierHeartRateVariabilitySDNN",
-              "HKQuantityTypeIdentifierRespiratoryRate"]
-
     result = {"timestamp": datetime.now().isoformat(), "vitals": {}}
 
-    for vital in vitals:
-        cursor = conn.execute("""
-            SELECT value, unit, start_date FROM health_records
-            WHERE record_type = ?
-            ORDER BY start_date DESC LIMIT 1
-        """, (vital,))
-        row = cursor.fetchone()
+    cursor = conn.execute(SQL_LATEST_VITALS, VITAL_TYPES)
+    latest = {row["record_type"]: row for row in cursor}
+
+    for vital, name in _VITAL_TO_FRIENDLY:
+        row = latest.get(vital)
         if row:
-            name = FRIENDLY_NAMES.get(vital, vital)
             result["vitals"][name] = {
                 "value": round(row["value"], 1) if row["value"] else None,
                 "unit": row["unit"],
                 "recorded": row["start_date"][:19]
             }
-
-    conn.close()
     return result
 
 
+@_ttl_cache()
 def activity_rings(days: int = 30) -> Dict[str, Any]:
     """Get activity ring completion data"""
     conn = get_connection()
     start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
-    cursor = conn.execute("""
-        SELECT * FROM activity_summaries
-        WHERE date >= ?
-        ORDER BY date DESC
-    """, (start_date,))
+    cursor = conn.execute(SQL_ACTIVITY_RINGS, (start_date,))
 
     result = {"period_days": days, "days": [], "summary": {}}
 
-    move_pct = []
-    exercise_pct = []
-    stand_pct = []
+    # Running [sum, count] per ring and the perfect-day tally are updated in
+    # the same pass that builds the rows, so the summary needs no second scan
+    totals = {"move": [0.0, 0], "exercise": [0.0, 0], "stand": [0.0, 0]}
+    perfect_days = 0
 
     for row in cursor:
         day = {
@@ -320,61 +767,52 @@ def activity_rings(days: int = 30) -> Dict[str, Any]:
             "stand": {"value": row["stand_hours"], "goal": row["stand_hours_goal"]},
         }
 
-        # Calculate percentages
-        if row["active_energy_goal"] and row["active_energy_goal"] > 0:
-            day["move"]["pct"] = round(row["active_energy_burned"] / row["active_energy_goal"] * 100, 1)
-            move_pct.append(day["move"]["pct"])
-        if row["exercise_time_goal"] and row["exercise_time_goal"] > 0:
-            day["exercise"]["pct"] = round(row["exercise_time_minutes"] / row["exercise_time_goal"] * 100, 1)
-            exercise_pct.append(day["exercise"]["pct"])
-        if row["stand_hours_goal"] and row["stand_hours_goal"] > 0:
-            day["stand"]["pct"] = round(row["stand_hours"] / row["stand_hours_goal"] * 100, 1)
-            stand_pct.append(day["stand"]["pct"])
+        # Round percentages; a day is perfect when all three reach 100%
+        perfect = True
+        for ring in ("move", "exercise", "stand"):
+            raw_pct = row[f"{ring}_pct"]
+            if raw_pct is None:
+                perfect = False
+                continue
+            pct = round(raw_pct, 1)
+            day[ring]["pct"] = pct
+            totals[ring][0] += pct
+            totals[ring][1] += 1
+            if pct < 100:
+                perfect = False
+        if perfect:
+            perfect_days += 1
 
         result["days"].append(day)
 
     # Summary
     result["summary"] = {
         "days_tracked": len(result["days"]),
-        "avg_move_pct": round(sum(move_pct) / len(move_pct), 1) if move_pct else 0,
-        "avg_exercise_pct": round(sum(exercise_pct) / len(exercise_pct), 1) if exercise_pct else 0,
-        "avg_stand_pct": round(sum(stand_pct) / len(stand_pct), 1) if stand_pct else 0,
-        "perfect_days": sum(1 for d in result["days"] if
-                          d.get("move", {}).get("pct", 0) >= 100 and
-                          d.get("exercise", {}).get("pct", 0) >= 100 and
-                          d.get("stand", {}).get("pct", 0) >= 100),
+        "avg_move_pct": round(totals["move"][0] / totals["move"][1], 1) if totals["move"][1] else 0,
+        "avg_exercise_pct": round(totals["exercise"][0] / totals["exercise"][1], 1) if totals["exercise"][1] else 0,
+        "avg_stand_pct": round(totals["stand"][0] / totals["stand"][1], 1) if totals["stand"][1] else 0,
+        "perfect_days": perfect_days,
     }
-
-    conn.close()
     return result
 
 
+@_ttl_cache()
 def workout_history(days: int = 30, workout_type: str = None) -> Dict[str, Any]:
     """Get workout history"""
     conn = get_connection()
     start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
-    query = """
-        SELECT workout_type, duration_minutes, total_distance, distance_unit,
-               total_energy_burned, energy_unit, start_date, end_date, source_name
-        FROM workouts
-        WHERE start_date >= ?
-    """
-    params = [start_date]
-
     if workout_type:
-        query += " AND workout_type LIKE ?"
-        params.append(f"%{workout_type}%")
-
-    query += " ORDER BY start_date DESC"
-
-    cursor = conn.execute(query, params)
+        cursor = conn.execute(SQL_WORKOUTS_BY_TYPE, (start_date, f"%{workout_type}%"))
+    else:
+        cursor = conn.execute(SQL_WORKOUTS, (start_date,))
 
     result = {"period_days": days, "workouts": [], "summary": {}}
 
+    # Summary totals accumulate in the same pass that builds the rows
     total_duration = 0
     total_calories = 0
-    types = {}
+    types = Counter()
 
     for row in cursor:
         workout = {
@@ -390,49 +828,80 @@ def workout_history(days: int = 30, workout_type: str = None) -> Dict[str, Any]:
         result["workouts"].append(workout)
         total_duration += workout["duration_min"]
         total_calories += workout["calories"]
-        types[workout["type"]] = types.get(workout["type"], 0) + 1
+        types[workout["type"]] += 1
 
     result["summary"] = {
         "total_workouts": len(result["workouts"]),
         "total_duration_min": round(total_duration, 1),
         "total_calories": round(total_calories, 1),
-        "by_type": types,
+        "by_type": dict(types),
     }
-
-    conn.close()
     return result
 
 
-def run_query(sql: str) -> List[Dict[str, Any]]:
-    """Run custom SQL query"""
+def run_query(sql: str) -> Iterator[sqlite3.Row]:
+    """Run custom SQL query, yielding rows as they are fetched.
+
+    Rows are pulled in pages of RUN_QUERY_PAGE_SIZE so large result sets
+    never sit in memory all at once. They are yielded as sqlite3.Row
+    (mapping-like, keys() in column order); to_json turns them into dicts.
+    """
     conn = get_connection()
     cursor = conn.execute(sql)
-    columns = [desc[0] for desc in cursor.description]
-    result = [dict(zip(columns, row)) for row in cursor.fetchall()]
-    conn.close()
-    return result
+    if cursor.description is None:
+        return
+    while True:
+        rows = cursor.fetchmany(RUN_QUERY_PAGE_SIZE)
+        if not rows:
+            break
+        yield from rows
 
 
 # ============================================================
 # Output Formatters
 # ============================================================
 
+# Sentinel for "iterator yielded nothing" (rows themselves may be None)
+_NO_ROW = object()
+
+# Row templates are parsed once here and filled with str.format_map
+_MD_ROW_FMT = "{prefix}| {cells} |"
+_METRIC_RANGE_FMT = "  {key:20s} avg:{avg:>6}  min:{min:>4}  max:{max:>4}"
+_RING_FMT = "  {ring:10s} [{bar}] {pct:5.1f}% ({val:.0f}/{goal:.0f})"
+_VITAL_FMT = "  {name:20s} {val:>8} {unit}"
+_STEPS_BAR_FMT = "    {week} {bar} {value:,}"
+_EXERCISE_BAR_FMT = "    {week} {bar} {value}"
+_SLEEP_FMT = "  {date} [{bar:30s}] {hours:.1f}h  (D:{deep:.0f}m R:{rem:.0f}m)"
+_WORKOUT_FMT = "  {date} {type:15s} {dur:5.0f}min {cal:5.0f}cal {dist}"
+
+
+def _row_values(row: Any, headers: List[str]) -> Any:
+    """Cell values of a table row in header order (sqlite3.Row or dict)"""
+    if isinstance(row, sqlite3.Row):
+        return tuple(row)
+    return [row.get(h, "") for h in headers]
+
+
 def to_markdown(data: Any, title: str = "Health Data") -> str:
     """Format data as Markdown"""
     lines = [f"# {title}", ""]
 
     if isinstance(data, dict):
         _dict_to_md(data, lines)
-    elif isinstance(data, list):
-        if data and isinstance(data[0], dict):
+    elif isinstance(data, (list, Iterator)):
+        rows = iter(data)
+        first = next(rows, _NO_ROW)
+        if isinstance(first, (dict, sqlite3.Row)):
             # Table format
-            headers = list(data[0].keys())
-            lines.append("| " + " | ".join(headers) + " |")
-            lines.append("| " + " | ".join(["---"] * len(headers)) + " |")
-            for row in data:
-                lines.append("| " + " | ".join(str(row.get(h, "")) for h in headers) + " |")
-        else:
-            for item in data:
+            headers = list(first.keys())
+            lines.append(_MD_ROW_FMT.format_map({"prefix": "", "cells": " | ".join(headers)}))
+            lines.append(_MD_ROW_FMT.format_map({"prefix": "", "cells": " | ".join(["---"] * len(headers))}))
+            lines.extend(
+                _MD_ROW_FMT.format_map({"prefix": "", "cells": " | ".join(map(str, _row_values(row, headers)))})
+                for row in chain((first,), rows)
+            )
+        elif first is not _NO_ROW:
+            for item in chain((first,), rows):
                 lines.append(f"- {item}")
     else:
         lines.append(str(data))
@@ -453,10 +922,15 @@ def _dict_to_md(d: Dict, lines: List[str], indent: int = 0):
                 # Table for list of dicts
                 headers = list(value[0].keys())
                 lines.append("")
-                lines.append(f"{prefix}| " + " | ".join(headers) + " |")
-                lines.append(f"{prefix}| " + " | ".join(["---"] * len(headers)) + " |")
-                for row in value[:20]:  # Limit to 20 rows
-                    lines.append(f"{prefix}| " + " | ".join(str(row.get(h, ""))[:30] for h in headers) + " |")
+                lines.append(_MD_ROW_FMT.format_map({"prefix": prefix, "cells": " | ".join(headers)}))
+                lines.append(_MD_ROW_FMT.format_map({"prefix": prefix, "cells": " | ".join(["---"] * len(headers))}))
+                lines.extend(  # Limit to 20 rows
+                    _MD_ROW_FMT.format_map({
+                        "prefix": prefix,
+                        "cells": " | ".join(str(row.get(h, ""))[:30] for h in headers),
+                    })
+                    for row in value[:20]
+                )
                 if len(value) > 20:
                     lines.append(f"{prefix}*... and {len(value) - 20} more*")
                 lines.append("")
@@ -466,7 +940,9 @@ def _dict_to_md(d: Dict, lines: List[str], indent: int = 0):
 
 def to_json(data: Any) -> str:
     """Format data as JSON"""
-    return json.dumps(data, indent=2, default=str)
+    if isinstance(data, Iterator):
+        data = [dict(zip(row.keys(), row)) if isinstance(row, sqlite3.Row) else row for row in data]
+    return _dump_json(data)
 
 
 def to_ascii(data: Any, title: str = "Health Data") -> str:
@@ -484,7 +960,9 @@ def to_ascii(data: Any, title: str = "Health Data") -> str:
                         avg_val = value['avg'] if value['avg'] is not None else 'N/A'
                         min_val = value.get('min', 'N/A') if value.get('min') is not None else 'N/A'
                         max_val = value.get('max', 'N/A') if value.get('max') is not None else 'N/A'
-                        lines.append(f"  {key:20s} avg:{str(avg_val):>6}  min:{str(min_val):>4}  max:{str(max_val):>4}")
+                        lines.append(_METRIC_RANGE_FMT.format_map({
+                            "key": key, "avg": str(avg_val), "min": str(min_val), "max": str(max_val),
+                        }))
                     else:
                         lines.append(f"  {key:20s} {value.get('value', 'N/A')}")
                 else:
@@ -500,16 +978,16 @@ def to_ascii(data: Any, title: str = "Health Data") -> str:
                 pct = min(val / goal * 100, 100) if goal else 0
                 bar_len = int(pct / 5)  # 20 chars = 100%
                 bar = "█" * bar_len + "░" * (20 - bar_len)
-                lines.append(f"  {ring:10s} [{bar}] {pct:5.1f}% ({val:.0f}/{goal:.0f})")
+                lines.append(_RING_FMT.format_map({"ring": ring, "bar": bar, "pct": pct, "val": val, "goal": goal}))
             lines.append("")
 
         if "vitals" in data:
             lines.append("VITALS")
             lines.append("-" * 40)
-            for name, info in data["vitals"].items():
-                val = info.get("value", "N/A")
-                unit = info.get("unit", "")
-                lines.append(f"  {name:20s} {val:>8} {unit}")
+            lines.extend(
+                _VITAL_FMT.format_map({"name": name, "val": info.get("value", "N/A"), "unit": info.get("unit", "")})
+                for name, info in data["vitals"].items()
+            )
             lines.append("")
 
         if "weeks" in data:
@@ -518,23 +996,25 @@ def to_ascii(data: Any, title: str = "Health Data") -> str:
             # Steps bar chart
             weeks = data["weeks"]
             if weeks:
-                max_steps = max(w["metrics"].get("avg_daily_steps", 0) for w in weeks) or 1
+                # One pass collects labels and values; bar lengths use integer
+                # floor division, which matches value / max * 30 exactly
+                labels = [w["week_of"][5:10] for w in weeks]
+                metrics = [w["metrics"] for w in weeks]
+                steps_col = [m.get("avg_daily_steps", 0) for m in metrics]
+                ex_col = [m.get("total_exercise_min", 0) for m in metrics]
+                max_steps = max(steps_col) or 1
                 lines.append("  Avg Daily Steps:")
-                for w in weeks:
-                    steps = w["metrics"].get("avg_daily_steps", 0)
-                    bar_len = int(steps / max_steps * 30)
-                    bar = "▓" * bar_len
-                    lines.append(f"    {w['week_of'][5:10]} {bar} {steps:,}")
+                for week, steps in zip(labels, steps_col):
+                    bar = "▓" * (steps * 30 // max_steps)
+                    lines.append(_STEPS_BAR_FMT.format_map({"week": week, "bar": bar, "value": steps}))
                 lines.append("")
 
                 # Exercise minutes
                 lines.append("  Exercise Minutes:")
-                max_ex = max(w["metrics"].get("total_exercise_min", 0) for w in weeks) or 1
-                for w in weeks:
-                    ex = w["metrics"].get("total_exercise_min", 0)
-                    bar_len = int(ex / max_ex * 30)
-                    bar = "▓" * bar_len
-                    lines.append(f"    {w['week_of'][5:10]} {bar} {ex}")
+                max_ex = max(ex_col) or 1
+                for week, ex in zip(labels, ex_col):
+                    bar = "▓" * (ex * 30 // max_ex)
+                    lines.append(_EXERCISE_BAR_FMT.format_map({"week": week, "bar": bar, "value": ex}))
             lines.append("")
 
         if "nights" in data:
@@ -550,7 +1030,9 @@ def to_ascii(data: Any, title: str = "Health Data") -> str:
                     deep = stages.get("Deep", 0) or 0
                     rem = stages.get("REM", 0) or 0
                     date_str = (n.get("date") or "????-??-??")[5:10]
-                    lines.append(f"  {date_str} [{bar:30s}] {hours:.1f}h  (D:{deep:.0f}m R:{rem:.0f}m)")
+                    lines.append(_SLEEP_FMT.format_map({
+                        "date": date_str, "bar": bar, "hours": hours, "deep": deep, "rem": rem,
+                    }))
             if "summary" in data:
                 lines.append("")
                 lines.append(f"  Average: {data['summary'].get('avg_sleep_hours', 0):.1f} hours/night")
@@ -573,33 +1055,42 @@ def to_ascii(data: Any, title: str = "Health Data") -> str:
             lines.append("WORKOUTS")
             lines.append("-" * 40)
             workouts = data.get("workouts", [])[:10]
-            for w in workouts:
-                dur = w.get("duration_min", 0)
-                cal = w.get("calories", 0)
-                dist = w.get("distance", "")
-                dist_str = f"{dist:.1f}km" if dist else ""
-                lines.append(f"  {w['date'][5:16]} {w['type']:15s} {dur:5.0f}min {cal:5.0f}cal {dist_str}")
+            lines.extend(
+                _WORKOUT_FMT.format_map({
+                    "date": w["date"][5:16],
+                    "type": w["type"],
+                    "dur": w.get("duration_min", 0),
+                    "cal": w.get("calories", 0),
+                    "dist": f"{w['distance']:.1f}km" if w.get("distance") else "",
+                })
+                for w in workouts
+            )
             if "summary" in data:
                 s = data["summary"]
                 lines.append("")
                 lines.append(f"  Total: {s.get('total_workouts', 0)} workouts, {s.get('total_duration_min', 0):.0f} min, {s.get('total_calories', 0):.0f} cal")
             lines.append("")
 
-    elif isinstance(data, list):
-        # Table format for query results
-        if data and isinstance(data[0], dict):
-            headers = list(data[0].keys())
-            col_widths = {h: max(len(h), max(len(str(row.get(h, ""))[:20]) for row in data)) for h in headers}
-
-            header_line = " | ".join(h.ljust(col_widths[h]) for h in headers)
+    elif isinstance(data, (list, Iterator)):
+        # Table format for query results: only the 30 displayed rows are
+        # materialized (and size the columns); the rest are just counted
+        rows = iter(data)
+        shown = list(islice(rows, 30))
+        if shown and isinstance(shown[0], (dict, sqlite3.Row)):
+            headers = list(shown[0].keys())
+            cells = [[str(v)[:20] for v in _row_values(row, headers)] for row in shown]
+            widths = [max(len(h), *(len(r[i]) for r in cells)) for i, h in enumerate(headers)]
+
+            header_line = " | ".join(h.ljust(w) for h, w in zip(headers, widths))
             lines.append(header_line)
             lines.append("-" * len(header_line))
 
-            for row in data[:30]:
-                lines.append(" | ".join(str(row.get(h, ""))[:20].ljust(col_widths[h]) for h in headers))
+            for row_cells in cells:
+                lines.append(" | ".join(c.ljust(w) for c, w in zip(row_cells, widths)))
 
-            if len(data) > 30:
-                lines.append(f"... and {len(data) - 30} more rows")
+            hidden = sum(1 for _ in rows)
+            if hidden:
+                lines.append(f"... and {hidden} more rows")
 
     lines.append("=" * 60)
     return "\n".join(lines)
@@ -624,7 +1115,7 @@ def to_fhir(data: Any, resource_type: str = "Observation") -> str:
             "resource": obs
         })
 
-    return json.dumps(bundle, indent=2)
+    return _dump_json(bundle)
 
 
 def _data_to_fhir_observations(data: Any) -> List[Dict]:
@@ -660,12 +1151,9 @@ def _create_fhir_observation(metric_name: str, value: Any, unit: str = None, tim
     loinc_display = metric_name
     ucum_unit = unit or ""
 
-    for hk_type, (code, display, ucum) in LOINC_CODES.items():
-        if metric_name.lower() in display.lower() or metric_name.lower() in hk_type.lower():
-            loinc_code = code
-            loinc_display = display
-            ucum_unit = ucum
-            break
+    entry = _loinc_lookup(metric_name)
+    if entry is not None:
+        loinc_code, loinc_display, ucum_unit = entry
 
     obs = {
         "resourceType": "Observation",
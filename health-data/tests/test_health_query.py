@@ -0,0 +1,161 @@
+"""Tests for health_query.py against a small on-disk database."""
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import health_query as hq
+
+
+SCHEMA = """
+    CREATE TABLE health_records (
+        id INTEGER PRIMARY KEY, record_type TEXT, value REAL, value_text TEXT,
+        unit TEXT, start_date TEXT, end_date TEXT, start_ts INTEGER, end_ts INTEGER,
+        source_id INTEGER, source_name TEXT, device TEXT, creation_date TEXT
+    );
+    CREATE TABLE workouts (
+        id INTEGER PRIMARY KEY, workout_type TEXT, duration_minutes REAL,
+        total_distance REAL, distance_unit TEXT, total_energy_burned REAL,
+        energy_unit TEXT, start_date TEXT, end_date TEXT, source_name TEXT, route_file TEXT
+    );
+    CREATE TABLE sleep_sessions (
+        id INTEGER PRIMARY KEY, start_date TEXT, end_date TEXT,
+        duration_minutes REAL, sleep_stage TEXT, source_name TEXT
+    );
+    CREATE TABLE activity_summaries (
+        id INTEGER PRIMARY KEY, date TEXT, active_energy_burned REAL,
+        active_energy_goal REAL, exercise_time_minutes REAL, exercise_time_goal REAL,
+        stand_hours INTEGER, stand_hours_goal INTEGER
+    );
+"""
+
+STEPS = "HKQuantityTypeIdentifierStepCount"
+
+
+@pytest.fixture
+def health_db(tmp_path, monkeypatch):
+    """A health.db with a few step samples, used as health_query's DB_PATH."""
+    db_path = tmp_path / "health.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO health_records (record_type, value, start_date, source_name) VALUES (?, ?, ?, ?)",
+        [
+            (STEPS, 1000, "2024-03-01 08:00:00 +0100", "Apple Watch"),
+            (STEPS, 500, "2024-03-01 12:00:00 +0100", "Apple Watch"),
+            (STEPS, 900, "2024-03-01 12:00:00 +0100", "iPhone"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(hq, "DB_PATH", db_path)
+    monkeypatch.setattr(hq, "AGGREGATES_CACHE_DIR", tmp_path / "cache")
+    _reset()
+    yield db_path
+    _reset()
+
+
+def _reset():
+    """Start over as a new process would: no open connections, no cached results."""
+    hq._close_connection()
+    for fn in (hq.daily_summary, hq.weekly_trends, hq.latest_vitals,
+               hq.activity_rings, hq.workout_history):
+        fn.cache_clear()
+
+
+def _write(db_path, sql, params=()):
+    """Change the database the way an external importer would."""
+    time.sleep(0.02)  # let the file mtime move on coarse-grained clocks
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def _watch_steps():
+    _reset()
+    return hq.daily_summary("2024-03-01")["metrics"]["steps"]
+
+
+def _schema_of(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+    finally:
+        conn.close()
+
+
+def test_read_only_database(health_db, monkeypatch):
+    """A 0o444 database is queried without being written to."""
+    before = _schema_of(health_db)
+    os.chmod(health_db, 0o444)
+    if os.geteuid() == 0:
+        # root may write to any file; report it the way a normal user sees it
+        real_access = os.access
+        monkeypatch.setattr(
+            os, "access", lambda path, mode: mode != os.W_OK and real_access(path, mode)
+        )
+
+    rows = list(hq.run_query("SELECT COUNT(*) AS n FROM health_records"))
+    assert rows[0]["n"] == 3
+    assert hq.sleep_analysis(7) is not None
+
+    hq._close_connection()
+    os.chmod(health_db, 0o644)
+    assert _schema_of(health_db) == before
+
+
+def test_health_records_columns_untouched(health_db):
+    """Querying never adds columns to the user's health_records table."""
+    conn = sqlite3.connect(health_db)
+    before = conn.execute("PRAGMA table_xinfo(health_records)").fetchall()
+    conn.close()
+
+    rows = list(hq.run_query("SELECT * FROM health_records LIMIT 1"))
+    assert len(rows[0].keys()) == len(before)
+
+    conn = sqlite3.connect(health_db)
+    assert conn.execute("PRAGMA table_xinfo(health_records)").fetchall() == before
+    conn.close()
+
+
+def test_daily_totals_follow_external_writes(health_db):
+    """Totals stay correct after inserts, replaces, updates and deletes."""
+    assert _watch_steps() == 1500
+
+    _write(health_db, "INSERT INTO health_records (record_type, value, start_date, source_name) "
+                      "VALUES (?, 100, '2024-03-01 20:00:00 +0100', 'Apple Watch')", (STEPS,))
+    assert _watch_steps() == 1600
+
+    _write(health_db, "INSERT OR REPLACE INTO health_records (id, record_type, value, start_date, source_name) "
+                      "VALUES (1, ?, 1200, '2024-03-01 08:00:00 +0100', 'Apple Watch')", (STEPS,))
+    assert _watch_steps() == 1800
+
+    _write(health_db, "UPDATE health_records SET value = 800 WHERE id = 2")
+    assert _watch_steps() == 2100
+
+    _write(health_db, "DELETE FROM health_records WHERE id = 1")
+    assert _watch_steps() == 900
+
+
+def test_aggregates_stay_out_of_health_db(health_db):
+    """The summary table and its bookkeeping are not created in health.db."""
+    assert _watch_steps() == 1500
+    names = {name for _, name, _ in _schema_of(health_db)}
+    assert "daily_aggregates" not in names
+    assert not any(kind == "trigger" for kind, _, _ in _schema_of(health_db))
+
+
+def test_unwritable_cache_builds_in_memory(health_db, monkeypatch, tmp_path):
+    """Without a writable cache directory the totals are still computed."""
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(hq, "AGGREGATES_CACHE_DIR", blocker / "cache")
+    assert _watch_steps() == 1500
+    assert hq.weekly_trends(1) is not None
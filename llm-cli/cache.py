@@ -0,0 +1,84 @@
+"""On-disk cache of LLM responses for repeated prompts."""
+
+import hashlib
+import os
+from pathlib import Path
+
+
+class FileLLMCache:
+    """Exact-match response cache stored as one file per prompt.
+
+    Entries are keyed by sha256(model + NUL + content). Reads refresh an
+    entry's mtime, and writes evict least recently used entries once the
+    cache grows past max_bytes.
+    """
+
+    CACHE_DIR = Path.home() / ".claude" / "llm-skill-cache"
+
+    def __init__(self, max_bytes: int = 1 << 30, cache_dir: Path = None):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes: Size limit for all cached responses (default 1 GB)
+            cache_dir: Directory holding the cache files
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir or self.CACHE_DIR
+
+    @staticmethod
+    def make_key(model: str, content: str) -> str:
+        """Build the cache key for a model and its input."""
+        return hashlib.sha256(f"{model}\x00{content}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.txt"
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response, or None on a miss."""
+        path = self._path(key)
+        try:
+            value = path.read_bytes().decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response; failures are ignored (caching is best-effort)."""
+        path = self._path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(value.encode("utf-8"))
+            os.replace(tmp, path)
+            self._evict()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".txt"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
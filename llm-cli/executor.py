@@ -1,9 +1,39 @@
 """LLM execution logic for interactive and non-interactive modes."""
 
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache, partial
 from typing import Optional
 
+from models import get_model
+
+# llm model objects resolved in this process, keyed by model name (None if
+# the llm library is unavailable or doesn't know the model)
+_MODEL_CACHE: dict = {}
+
+
+@cache
+def _llm_library():
+    """Import the llm package on first use (it loads every provider plugin)."""
+    try:
+        import llm
+    except ImportError:  # llm installed as a standalone CLI (e.g. via pipx)
+        return None
+    return llm
+
+
+def _load_model(name: str):
+    """Resolve a model through the llm library, or None to fall back to the CLI."""
+    if name not in _MODEL_CACHE:
+        llm = _llm_library()
+        try:
+            _MODEL_CACHE[name] = llm.get_model(name) if llm is not None else None
+        except llm.UnknownModelError:
+            _MODEL_CACHE[name] = None
+    return _MODEL_CACHE[name]
+
 
 class LLMExecutor:
     """Handles execution of LLM CLI with various modes."""
@@ -32,6 +62,12 @@ class LLMExecutor:
         if not content.strip():
             raise ValueError("No content provided")
 
+        # Prompt in-process when the llm library is importable: no child
+        # interpreter, config re-parse or fresh provider connection per call
+        model = _load_model(self.model)
+        if model is not None:
+            return self._prompt_model(model, content)
+
         cmd = ["llm", self.model]
 
         try:
@@ -57,60 +93,104 @@ class LLMExecutor:
         except subprocess.TimeoutExpired:
             raise RuntimeError("LLM execution timed out after 5 minutes")
 
-    def execute_interactive(self) -> None:
+    def execute_streaming(self, content: str) -> str | None:
         """
-        Execute LLM in interactive mode (conversation REPL).
+        Execute LLM, writing output to stdout as it is generated.
 
-        Starts an interactive conversation loop that continues until user exits.
+        Args:
+            content: Input text to process
+
+        Returns:
+            The full output when prompted in-process (for caching), or None
+            when the llm CLI wrote straight to the terminal
         """
-        cmd = ["llm", self.model]
+        if not content.strip():
+            raise ValueError("No content provided")
 
-        try:
-            print(f"Starting interactive session with {self.model}...")
-            print("Type 'exit', 'quit', or Ctrl+D to end conversation.\n")
+        model = _load_model(self.model)
+        if model is not None:
+            try:
+                response = model.prompt(content)
+                for chunk in response:
+                    sys.stdout.write(chunk)
+                    sys.stdout.flush()
+                sys.stdout.write("\n")
+                return response.text() + "\n"
+            except Exception as e:
+                raise RuntimeError(f"LLM execution failed: {e}") from e
 
-            # Start the llm interactive process
+        # The child inherits our stdout, so tokens reach the terminal
+        # without passing through this process
+        sys.stdout.flush()
+        try:
             process = subprocess.Popen(
-                cmd,
+                ["llm", self.model],
                 stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
-                bufsize=1,
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                "llm CLI not found. Install with: pip install llm"
             )
 
-            try:
-                while True:
-                    # Read user input
-                    try:
-                        user_input = input("You: ").strip()
-                    except EOFError:
-                        break
-
-                    if user_input.lower() in {"exit", "quit"}:
-                        break
-
-                    if not user_input:
-                        continue
-
-                    # Send to LLM and get response
-                    try:
-                        stdout, stderr = process.communicate(
-                            input=user_input + "\n",
-                            timeout=60,
-                        )
-                        if stdout:
-                            print(f"Assistant: {stdout.strip()}\n")
-                        if stderr:
-                            print(f"Error: {stderr}", file=sys.stderr)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                        print("Response timeout. Ending session.")
-                        break
-
-            finally:
-                if process.poll() is None:
-                    process.terminate()
+        try:
+            _, stderr = process.communicate(input=content, timeout=300)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise RuntimeError("LLM execution timed out after 5 minutes")
+
+        if process.returncode != 0:
+            raise RuntimeError(f"LLM execution failed: {stderr}")
+        return None
+
+    @staticmethod
+    def _prompt_model(model, content: str, **kwargs) -> str:
+        """Prompt an llm library model in-process."""
+        try:
+            # Trailing newline matches what the llm CLI prints
+            return model.prompt(content, **kwargs).text() + "\n"
+        except Exception as e:
+            raise RuntimeError(f"LLM execution failed: {e}") from e
+
+    def execute_many(
+        self, contents: list[str], prompt: str = None, max_concurrency: int = 4
+    ) -> list[str]:
+        """
+        Execute LLM on several independent inputs concurrently.
+
+        Args:
+            contents: Input texts to process
+            prompt: Optional instruction prepended to every input
+            max_concurrency: Maximum number of requests in flight
+
+        Returns:
+            LLM outputs, in the same order as contents
+        """
+        if not contents:
+            return []
+
+        run = partial(self.execute_with_prompt, prompt) if prompt else self.execute_non_interactive
+        workers = max(1, min(max_concurrency, len(contents)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, contents))
+
+    def execute_interactive(self) -> None:
+        """
+        Execute LLM in interactive mode (conversation REPL).
+
+        Starts an interactive conversation loop that continues until user exits.
+        """
+        try:
+            print(f"Starting interactive session with {self.model}...")
+            print("Type 'exit', 'quit', or Ctrl+D to end conversation.\n")
+
+            model = _load_model(self.model)
+            if model is not None:
+                self._chat_in_process(model)
+            else:
+                self._chat_with_cli()
 
         except FileNotFoundError:
             raise RuntimeError(
@@ -119,6 +199,60 @@ class LLMExecutor:
         except KeyboardInterrupt:
             print("\n\nSession ended.")
 
+    @staticmethod
+    def _user_turns():
+        """Yield each message the user types, until exit, quit or EOF."""
+        while True:
+            try:
+                user_input = input("You: ").strip()
+            except EOFError:
+                return
+
+            if user_input.lower() in {"exit", "quit"}:
+                return
+
+            if user_input:
+                yield user_input
+
+    def _chat_in_process(self, model) -> None:
+        """Hold the conversation through the llm library, streaming each reply."""
+        # The conversation object carries the history from turn to turn
+        conversation = model.conversation()
+        for user_input in self._user_turns():
+            try:
+                for chunk in conversation.prompt(user_input):
+                    sys.stdout.write(chunk)
+                    sys.stdout.flush()
+            except Exception as e:
+                raise RuntimeError(f"LLM execution failed: {e}") from e
+            sys.stdout.write("\n")
+
+    def _chat_with_cli(self) -> None:
+        """Hold the conversation with one llm CLI process per turn.
+
+        A reply is complete when its process exits. Later turns pass -c to
+        continue the conversation the previous turn logged.
+        """
+        cmd = ["llm", "-m", self.model]
+        for user_input in self._user_turns():
+            # The child inherits our stdout, so the reply streams to the terminal
+            sys.stdout.flush()
+            try:
+                result = subprocess.run(
+                    cmd,
+                    input=user_input,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    timeout=300,  # 5 minute timeout
+                )
+            except subprocess.TimeoutExpired:
+                print("Response timeout. Ending session.")
+                return
+
+            if result.returncode != 0:
+                raise RuntimeError(f"LLM execution failed: {result.stderr}")
+            cmd = ["llm", "-m", self.model, "-c"]
+
     def execute_with_prompt(self, prompt: str, content: str) -> str:
         """
         Execute LLM with a custom prompt and content.
@@ -133,6 +267,18 @@ class LLMExecutor:
         if not content.strip():
             raise ValueError("No content provided")
 
+        # Providers that cache prompt prefixes (see "cacheable" in MODELS)
+        # get the prompt as a separate system message, so a prompt reused
+        # across calls is a stable prefix the provider can serve from cache
+        model = _load_model(self.model)
+        if model is not None and (get_model(self.model) or {}).get("cacheable"):
+            options = {}
+            # Anthropic needs an explicit cache_control marker, which the
+            # llm-anthropic plugin sets through its "cache" option
+            if "cache" in getattr(model.Options, "model_fields", {}):
+                options["cache"] = True
+            return self._prompt_model(model, content, system=prompt, **options)
+
         # Combine prompt and content
         full_input = f"{prompt}\n\n{content}"
 
@@ -140,20 +286,13 @@ class LLMExecutor:
 
     @staticmethod
     def check_llm_installed() -> bool:
-        """Check if llm CLI is installed."""
-        try:
-            subprocess.run(
-                ["llm", "--version"],
-                capture_output=True,
-                timeout=5,
-            )
-            return True
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        """Check if llm CLI is installed (on PATH)."""
+        return shutil.which("llm") is not None
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_llm_version() -> str | None:
-        """Get installed llm CLI version."""
+        """Get installed llm CLI version (probed once per process)."""
         try:
             result = subprocess.run(
                 ["llm", "--version"],
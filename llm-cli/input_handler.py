@@ -1,14 +1,35 @@
 """Input handling and file processing."""
 
-import base64
+import os
 import sys
 from pathlib import Path
 
 
+def _pdfium_page_range(args) -> list[str]:
+    """Text of pages [start, stop) of a PDF (a path, or an open PdfDocument)."""
+    import pypdfium2 as pdfium
+
+    source, start, stop = args
+    pdf = pdfium.PdfDocument(source) if isinstance(source, str) else source
+    texts = []
+    try:
+        for index in range(start, stop):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            # PDFium separates lines with CRLF; PyPDF2 (and callers) use LF
+            texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+    finally:
+        if pdf is not source:
+            pdf.close()
+    return texts
+
+
 class InputHandler:
     """Handles various input types (stdin, file, text)."""
 
-    SUPPORTED_EXTENSIONS = {
+    SUPPORTED_EXTENSIONS = frozenset({
         ".txt",
         ".md",
         ".json",
@@ -26,19 +47,13 @@ class InputHandler:
         ".yml",
         ".toml",
         ".sh",
-    }
+    })
 
-    SUPPORTED_MEDIA_EXTENSIONS = {
-        ".pdf",
-        ".jpg",
-        ".jpeg",
-        ".png",
-        ".gif",
-        ".webp",
-        ".mp3",
-        ".wav",
-        ".m4a",
-    }
+    IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp"})
+
+    AUDIO_EXTENSIONS = frozenset({".mp3", ".wav", ".m4a"})
+
+    SUPPORTED_MEDIA_EXTENSIONS = frozenset({".pdf"}) | IMAGE_EXTENSIONS | AUDIO_EXTENSIONS
 
     @staticmethod
     def has_stdin() -> bool:
@@ -47,8 +62,12 @@ class InputHandler:
 
     @staticmethod
     def read_stdin() -> str:
-        """Read all data from stdin."""
-        return sys.stdin.read()
+        """Read all data from stdin.
+
+        The raw bytes are read in one call and decoded once, skipping the
+        text layer's chunked decoding and newline translation.
+        """
+        return sys.stdin.buffer.read().decode("utf-8", errors="replace")
 
     @staticmethod
     def load_input(source: str | None = None) -> tuple[str, str]:
@@ -86,73 +105,143 @@ class InputHandler:
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        ext = file_path.suffix.lower()
+        handler = InputHandler._DISPATCH.get(file_path.suffix.lower(), InputHandler._handle_unknown)
+        return handler(file_path)
 
-        # Handle text files
-        if ext in InputHandler.SUPPORTED_EXTENSIONS:
-            with open(file_path) as f:
-                content = f.read()
-            return content, f"file:{file_path.name}"
-
-        # Handle media files (base64 encode)
-        if ext in InputHandler.SUPPORTED_MEDIA_EXTENSIONS:
-            if ext == ".pdf":
-                return InputHandler._handle_pdf(file_path)
-            elif ext in {".jpg", ".jpeg", ".png", ".gif", ".webp"}:
-                return InputHandler._handle_image(file_path)
-            elif ext in {".mp3", ".wav", ".m4a"}:
-                return InputHandler._handle_audio(file_path)
+    @staticmethod
+    def _handle_text(file_path: Path) -> tuple[str, str]:
+        """Handle supported text files."""
+        with open(file_path) as f:
+            content = f.read()
+        return content, f"file:{file_path.name}"
 
-        # Default: try to read as text
+    @staticmethod
+    def _handle_unknown(file_path: Path) -> tuple[str, str]:
+        """Handle other extensions by trying to read them as text."""
         try:
-            with open(file_path) as f:
-                content = f.read()
-            return content, f"file:{file_path.name}"
+            return InputHandler._handle_text(file_path)
         except UnicodeDecodeError:
             raise ValueError(
                 f"Cannot read file: {file_path}. Unsupported format or binary file."
             )
 
+    # Read size for base64 encoding; a multiple of 3 so each chunk encodes
+    # without padding and the pieces concatenate into valid base64
+    B64_CHUNK_SIZE = 3 * 1024 * 1024
+
+    @staticmethod
+    def _b64_chunks(file_path: Path):
+        """Yield the base64 encoding of a file as str pieces, one chunk at a time."""
+        import base64
+
+        with open(file_path, "rb") as f:
+            while chunk := f.read(InputHandler.B64_CHUNK_SIZE):
+                yield base64.b64encode(chunk).decode("ascii")
+
+    @staticmethod
+    def _media_content(label: str, file_path: Path, mime_type: str) -> str:
+        """Build the prompt text for a base64-embedded media file.
+
+        The file is encoded chunk by chunk and joined once, so the whole raw
+        file and a full-size intermediate encoding are never held together.
+        """
+        header = f"[{label}: {file_path.name}]\nMIME: {mime_type}\nBase64:\n"
+        return "".join([header, *InputHandler._b64_chunks(file_path)])
+
     @staticmethod
     def _handle_image(file_path: Path) -> tuple[str, str]:
         """Handle image files by base64 encoding."""
-        with open(file_path, "rb") as f:
-            data = f.read()
-        b64 = base64.b64encode(data).decode()
         ext = file_path.suffix.lower().lstrip(".")
-        mime_type = f"image/{ext}"
-        content = f"[Image: {file_path.name}]\nMIME: {mime_type}\nBase64:\n{b64}"
+        content = InputHandler._media_content("Image", file_path, f"image/{ext}")
         return content, f"image:{file_path.name}"
 
+    # Extracted PDF text, keyed by path + mtime + size
+    PDF_CACHE_DIR = Path.home() / ".cache" / "llm-skill" / "pdfs"
+
+    # PDFs with more pages than this are split across worker processes
+    PDF_PARALLEL_MIN_PAGES = 32
+
     @staticmethod
     def _handle_pdf(file_path: Path) -> tuple[str, str]:
         """Handle PDF files."""
+        import hashlib
+
+        stat = file_path.stat()
+        key = f"{file_path.resolve()}\0{stat.st_mtime_ns}\0{stat.st_size}"
+        cache_file = InputHandler.PDF_CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.txt"
+        try:
+            return cache_file.read_bytes().decode("utf-8"), f"pdf:{file_path.name}"
+        except (OSError, UnicodeDecodeError):
+            pass
+
+        try:
+            import pypdfium2  # noqa: F401
+            pages = InputHandler._pdfium_pages(file_path)
+        except ImportError:
+            pages = InputHandler._pypdf2_pages(file_path)
+        text = "".join(page + "\n" for page in pages)
+
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(text.encode("utf-8"))
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass  # caching is best-effort
+
+        return text, f"pdf:{file_path.name}"
+
+    @staticmethod
+    def _pdfium_pages(file_path: Path) -> list[str]:
+        """Extract page texts with PDFium, in parallel for large documents."""
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(str(file_path))
+        try:
+            page_count = len(pdf)
+            if page_count <= InputHandler.PDF_PARALLEL_MIN_PAGES:
+                return _pdfium_page_range((pdf, 0, page_count))
+        finally:
+            pdf.close()
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = min(os.cpu_count() or 1, 8)
+        step = -(-page_count // workers)
+        ranges = [(str(file_path), start, min(start + step, page_count))
+                  for start in range(0, page_count, step)]
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            return [text for chunk in pool.map(_pdfium_page_range, ranges) for text in chunk]
+
+    @staticmethod
+    def _pypdf2_pages(file_path: Path) -> list[str]:
+        """Extract page texts with PyPDF2 (pure Python fallback)."""
         try:
             import PyPDF2
         except ImportError:
             raise ImportError(
-                "PDF support requires PyPDF2. Install with: pip install PyPDF2"
+                "PDF support requires pypdfium2 or PyPDF2. Install with: pip install pypdfium2"
             )
 
         with open(file_path, "rb") as f:
             reader = PyPDF2.PdfReader(f)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-
-        return text, f"pdf:{file_path.name}"
+            return [page.extract_text() for page in reader.pages]
 
     @staticmethod
     def _handle_audio(file_path: Path) -> tuple[str, str]:
         """Handle audio files by base64 encoding."""
-        with open(file_path, "rb") as f:
-            data = f.read()
-        b64 = base64.b64encode(data).decode()
         ext = file_path.suffix.lower().lstrip(".")
-        mime_type = f"audio/{ext}"
-        content = f"[Audio: {file_path.name}]\nMIME: {mime_type}\nBase64:\n{b64}"
+        content = InputHandler._media_content("Audio", file_path, f"audio/{ext}")
         return content, f"audio:{file_path.name}"
 
+    # Lowercased extension -> handler, used by load_file
+    _DISPATCH = {
+        **dict.fromkeys(SUPPORTED_EXTENSIONS, _handle_text),
+        **dict.fromkeys(IMAGE_EXTENSIONS, _handle_image),
+        **dict.fromkeys(AUDIO_EXTENSIONS, _handle_audio),
+        ".pdf": _handle_pdf,
+    }
+
     @staticmethod
     def get_file_info(file_path: Path) -> dict:
         """Get metadata about a file."""
@@ -2,11 +2,10 @@
 """Main LLM CLI Skill - Orchestrates model selection and execution."""
 
 import argparse
+import glob
 import sys
 from pathlib import Path
 
-from executor import LLMExecutor
-from input_handler import InputHandler
 from models import PROVIDER_ALIASES, get_model, get_models_by_provider, resolve_provider_alias
 from providers import ConfigManager, ProviderDetector
 
@@ -63,16 +62,16 @@ class LLMSkill:
 
     def _interactive_model_selection(self) -> tuple[str, str]:
         """Show interactive model selection menu."""
-        available_providers = self.detector.get_available_providers()
+        available_providers = self.detector.get_cached_providers(self.config, self.config.should_probe_ollama())
 
         if not available_providers:
             print("❌ No LLM providers available!")
             self.detector.suggest_providers_setup([])
             sys.exit(1)
 
-        print("Available Providers:")
-        for i, provider in enumerate(available_providers, 1):
-            print(f"  {i}. {provider.capitalize()}")
+        lines = ["Available Providers:"]
+        lines.extend(f"  {i}. {provider.capitalize()}" for i, provider in enumerate(available_providers, 1))
+        sys.stdout.write("\n".join(lines) + "\n")
 
         try:
             choice = int(input("Select provider (number): "))
@@ -97,10 +96,11 @@ class LLMSkill:
 
     def _show_model_menu(self, models: list, provider: str) -> tuple[str, str]:
         """Display model selection menu."""
-        print(f"\nAvailable {provider.capitalize()} Models:")
-        for i, (name, config) in enumerate(models, 1):
-            desc = config.get("description", "")
-            print(f"  {i}. {name} - {desc}")
+        lines = ["", f"Available {provider.capitalize()} Models:"]
+        lines.extend(
+            f"  {i}. {name} - {config.get('description', '')}" for i, (name, config) in enumerate(models, 1)
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
 
         try:
             choice = int(input(f"Select model (1-{len(models)}): "))
@@ -128,6 +128,11 @@ class LLMSkill:
             self._setup_mode()
             return
 
+        # Imported here so --help, --version and --setup don't load them
+        from cache import FileLLMCache
+        from executor import LLMExecutor
+        from input_handler import InputHandler
+
         # Check if llm CLI is installed
         if not LLMExecutor.check_llm_installed():
             print("❌ llm CLI not found!")
@@ -138,6 +143,10 @@ class LLMSkill:
         model, provider = self.select_model(parsed.model)
         self.config.set_last_model(model, provider)
 
+        if parsed.batch:
+            self._run_batch(parsed.batch, parsed.prompt, model, provider)
+            return
+
         # Load input
         content, source = InputHandler.load_input(parsed.prompt)
 
@@ -151,14 +160,54 @@ class LLMSkill:
 
         try:
             if parsed.interactive:
+                # Conversations are stateful, so they are never cached
                 executor.execute_interactive()
             else:
-                output = executor.execute_non_interactive(content)
-                print(output, end="")
+                cache = None if parsed.no_cache else FileLLMCache(self.config.get_cache_max_bytes())
+                key = FileLLMCache.make_key(model, content)
+                output = cache.get(key) if cache else None
+                if output is not None:
+                    print(output, end="")
+                    return
+
+                # Stream to a terminal by default; capture when piped
+                stream = sys.stdout.isatty() if parsed.stream is None else parsed.stream
+                if stream:
+                    output = executor.execute_streaming(content)
+                else:
+                    output = executor.execute_non_interactive(content)
+                    print(output, end="")
+                if cache and output is not None:
+                    cache.set(key, output)
         except RuntimeError as e:
             print(f"❌ Error: {e}", file=sys.stderr)
             sys.exit(1)
 
+    def _run_batch(self, pattern: str, prompt: str | None, model: str, provider: str) -> None:
+        """Process every file matching a glob pattern concurrently."""
+        from executor import LLMExecutor
+        from input_handler import InputHandler
+
+        paths = sorted(Path(p) for p in glob.glob(pattern, recursive=True) if Path(p).is_file())
+        if not paths:
+            print(f"❌ No files match: {pattern}", file=sys.stderr)
+            sys.exit(1)
+
+        contents = [InputHandler.load_file(path)[0] for path in paths]
+        executor = LLMExecutor(model, provider)
+
+        try:
+            outputs = executor.execute_many(
+                contents, prompt=prompt, max_concurrency=self.config.get_max_concurrency()
+            )
+        except (RuntimeError, ValueError) as e:
+            print(f"❌ Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        for path, output in zip(paths, outputs):
+            print(f"=== {path} ===")
+            print(output, end="")
+
     def _setup_mode(self) -> None:
         """Run setup to detect and display available providers."""
         print("🔍 Scanning for available LLM providers...\n")
@@ -199,6 +248,26 @@ class LLMSkill:
             help="Start interactive conversation mode",
         )
 
+        parser.add_argument(
+            "--stream",
+            action=argparse.BooleanOptionalAction,
+            default=None,
+            help="Print output as it is generated (default: on when stdout is a terminal)",
+        )
+
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Always query the model, bypassing the response cache",
+        )
+
+        parser.add_argument(
+            "--batch",
+            metavar="GLOB",
+            default=None,
+            help="Process every file matching GLOB concurrently (prompt is applied to each)",
+        )
+
         parser.add_argument(
             "--setup",
             action="store_true",
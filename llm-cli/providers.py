@@ -1,30 +1,126 @@
 """Provider detection and configuration management."""
 
-import json
 import os
-import subprocess
+import socket
 import sys
+import threading
+import time
+from functools import cache, cached_property
 from pathlib import Path
 
 
+@cache
+def _json_codec():
+    """(dumps, loads) pair for the config file, picked on first use.
+
+    The file is machine-written, so it is stored as compact JSON.
+
+    Imported lazily so a fresh install (no config file yet) never pays for
+    orjson or json at startup.
+    """
+    try:
+        import orjson
+
+        return orjson.dumps, orjson.loads
+    except ImportError:
+        import json
+
+        return lambda data: json.dumps(data, separators=(",", ":")).encode(), json.loads
+
+
+def _dumps(data: dict) -> bytes:
+    return _json_codec()[0](data)
+
+
+def _loads(data: bytes):
+    return _json_codec()[1](data)
+
+
+# Setup help, emitted with one write each by suggest_providers_setup
+_NO_PROVIDERS_HELP = """\
+❌ No LLM providers detected!
+
+To use this skill, you need to set up at least one provider:
+
+1. OpenAI:
+   export OPENAI_API_KEY='sk-...'
+
+2. Anthropic:
+   export ANTHROPIC_API_KEY='sk-ant-...'
+
+3. Google Gemini:
+   export GOOGLE_API_KEY='...'
+
+4. Ollama (local):
+   - Install from https://ollama.ai
+   - Run: ollama serve
+"""
+
+_EXTRA_PROVIDERS_HELP = """
+5. Groq (free, fast Llama models):
+   export GROQ_API_KEY='...'
+   Get key from: https://console.groq.com/keys
+
+6. OpenRouter (unified API for 200+ models):
+   export OPENROUTER_API_KEY='sk-or-...'
+   Get key from: https://openrouter.ai
+"""
+
+
 class ConfigManager:
     """Manages persistent configuration for the skill."""
 
     CONFIG_PATH = Path.home() / ".claude" / "llm-skill-config.json"
 
+    # Seconds a recorded provider list is served without re-detecting first
+    PROVIDERS_TTL = 3600
+
+    # Serializes updates from the background provider refresh
+    _lock = threading.Lock()
+
+    _instance = None
+
+    def __new__(cls):
+        """Return the process-wide config manager."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._config = None
+            cls._instance._loaded_mtime = None
+        return cls._instance
+
     def __init__(self):
-        """Initialize config manager."""
-        self.config = self._load_config()
+        """Initialize config manager (drops the loaded config if the file changed)."""
+        if self._config is not None and self._config_mtime() != self._loaded_mtime:
+            self._config = None
+            self._drop_cached("last_model", "available_providers")
+
+    def _drop_cached(self, *names: str) -> None:
+        """Forget cached_property values so they are re-read from the config."""
+        for name in names:
+            self.__dict__.pop(name, None)
+
+    @property
+    def config(self) -> dict:
+        """The config dict, read from disk on first access."""
+        if self._config is None:
+            self._loaded_mtime = self._config_mtime()
+            self._config = self._load_config()
+        return self._config
+
+    def _config_mtime(self) -> int | None:
+        """Modification time of the config file, or None if it is missing."""
+        try:
+            return self.CONFIG_PATH.stat().st_mtime_ns
+        except OSError:
+            return None
 
     def _load_config(self) -> dict:
         """Load config from file or create default."""
-        if self.CONFIG_PATH.exists():
-            try:
-                with open(self.CONFIG_PATH) as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return self._default_config()
-        return self._default_config()
+        # One open attempt; a missing file is just another OSError
+        try:
+            return _loads(self.CONFIG_PATH.read_bytes())
+        except (ValueError, OSError):  # both JSONDecodeErrors are ValueErrors
+            return self._default_config()
 
     def _default_config(self) -> dict:
         """Return default configuration."""
@@ -32,107 +128,191 @@ class ConfigManager:
             "last_model": None,
             "last_provider": None,
             "available_providers": [],
+            "available_providers_ts": None,
             "auto_detect": True,
+            "max_concurrency": 4,
+            "cache_max_bytes": 1 << 30,
         }
 
     def save(self) -> None:
-        """Save config to file."""
+        """Save config to file (atomically, so a crash never leaves it half-written)."""
         self.CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.CONFIG_PATH, "w") as f:
-            json.dump(self.config, f, indent=2)
+        tmp = self.CONFIG_PATH.with_suffix(".json.tmp")
+        tmp.write_bytes(_dumps(self.config))
+        os.replace(tmp, self.CONFIG_PATH)
+        self._loaded_mtime = self._config_mtime()
+
+    def update(self, **fields) -> None:
+        """Set several config fields with a single save (none if nothing changed)."""
+        with self._lock:
+            config = self.config
+            if all(key in config and config[key] == value for key, value in fields.items()):
+                return
+            self._drop_cached(*fields)
+            config.update(fields)
+            self.save()
+
+    @cached_property
+    def last_model(self) -> str | None:
+        """Last used model."""
+        return self.config.get("last_model")
+
+    @cached_property
+    def available_providers(self) -> list[str]:
+        """Providers recorded by the last setup run."""
+        return self.config.get("available_providers", [])
 
     def get_last_model(self) -> str | None:
         """Get last used model."""
-        return self.config.get("last_model")
+        return self.last_model
 
     def set_last_model(self, model: str, provider: str) -> None:
         """Save last used model."""
-        self.config["last_model"] = model
-        self.config["last_provider"] = provider
-        self.save()
+        self.update(last_model=model, last_provider=provider)
 
     def get_available_providers(self) -> list[str]:
         """Get list of available providers."""
-        return self.config.get("available_providers", [])
+        return self.available_providers
+
+    def get_max_concurrency(self) -> int:
+        """Get maximum number of concurrent requests for batch mode."""
+        return self.config.get("max_concurrency", 4)
+
+    def get_cache_max_bytes(self) -> int:
+        """Get size limit of the response cache."""
+        return self.config.get("cache_max_bytes", 1 << 30)
+
+    def should_probe_ollama(self) -> bool:
+        """Whether provider detection should look for a local Ollama server."""
+        if not self.config.get("auto_detect", True):
+            return False
+        last_provider = self.config.get("last_provider")
+        return not last_provider or last_provider == "ollama"
+
+    def providers_fresh(self) -> bool:
+        """Whether the recorded provider list is younger than PROVIDERS_TTL."""
+        recorded_at = self.config.get("available_providers_ts")
+        return recorded_at is not None and time.time() - recorded_at < self.PROVIDERS_TTL
 
     def set_available_providers(self, providers: list[str]) -> None:
-        """Save list of available providers."""
-        self.config["available_providers"] = providers
-        self.save()
+        """Save list of available providers (and when they were detected)."""
+        # Order doesn't matter; don't rewrite the file just to reorder it or
+        # to re-stamp a list that is still fresh
+        if set(self.available_providers) == set(providers) and self.providers_fresh():
+            return
+        self.update(available_providers=providers, available_providers_ts=time.time())
 
 
 class ProviderDetector:
     """Detects available LLM providers via environment variables."""
 
-    ENV_VARS = {
-        "openai": "OPENAI_API_KEY",
-        "anthropic": "ANTHROPIC_API_KEY",
-        "google": "GOOGLE_API_KEY",
-        "groq": "GROQ_API_KEY",
-        "openrouter": "OPENROUTER_API_KEY",
-        "ollama": "OLLAMA_BASE_URL",
-    }
+    # (provider, environment variable) pairs, in display order
+    ENV_VARS: tuple[tuple[str, str], ...] = (
+        ("openai", "OPENAI_API_KEY"),
+        ("anthropic", "ANTHROPIC_API_KEY"),
+        ("google", "GOOGLE_API_KEY"),
+        ("groq", "GROQ_API_KEY"),
+        ("openrouter", "OPENROUTER_API_KEY"),
+        ("ollama", "OLLAMA_BASE_URL"),
+    )
+    _ENV_VAR_SET: frozenset[str] = frozenset(env_var for _, env_var in ENV_VARS)
 
-    @staticmethod
-    def detect_providers() -> dict[str, bool]:
-        """Detect available providers from environment variables."""
-        available = {}
+    # Detection results; the environment doesn't change mid-process
+    _env_providers: tuple[str, ...] | None = None
+    _ollama_running: bool | None = None
+
+    @classmethod
+    def get_available_providers(cls, probe_ollama: bool = True) -> list[str]:
+        """
+        Get list of available providers, in display order (env vars read once per process).
 
-        for provider, env_var in ProviderDetector.ENV_VARS.items():
-            available[provider] = bool(os.getenv(env_var))
+        Args:
+            probe_ollama: Look for a local Ollama server when OLLAMA_BASE_URL is unset
+        """
+        if cls._env_providers is None:
+            # One set intersection against the environment instead of a lookup
+            # per provider; os.environ is bound once rather than per variable
+            env = os.environ
+            present = env.keys() & cls._ENV_VAR_SET
+            cls._env_providers = tuple(
+                provider for provider, env_var in cls.ENV_VARS if env_var in present and env[env_var]
+            )
+        available = list(cls._env_providers)
 
         # Special check for ollama: can run without env var if local
-        if not available["ollama"]:
-            available["ollama"] = ProviderDetector._check_ollama_running()
+        # (ollama is last in display order, so appending keeps the order)
+        if probe_ollama and "ollama" not in available:
+            if cls._ollama_running is None:
+                cls._ollama_running = cls._check_ollama_running()
+            if cls._ollama_running:
+                available.append("ollama")
+
+        return available
+
+    @classmethod
+    def get_cached_providers(cls, config: ConfigManager, probe_ollama: bool = True) -> list[str]:
+        """
+        Get available providers, serving the list recorded in the config while it is fresh.
 
+        A fresh list is returned immediately and re-detected on a daemon thread;
+        a stale or missing one is detected (and recorded) before returning.
+
+        Args:
+            config: Config holding the recorded provider list
+            probe_ollama: Look for a local Ollama server when OLLAMA_BASE_URL is unset
+        """
+        if config.available_providers and config.providers_fresh():
+            threading.Thread(target=cls._refresh, args=(config, probe_ollama), daemon=True).start()
+            return list(config.available_providers)
+        return cls._refresh(config, probe_ollama)
+
+    @classmethod
+    def _refresh(cls, config: ConfigManager, probe_ollama: bool) -> list[str]:
+        """Detect providers and record them in the config."""
+        available = cls.get_available_providers(probe_ollama)
+        try:
+            config.set_available_providers(available)
+        except OSError:
+            pass  # recording is best-effort; detection still succeeded
         return available
 
+    @classmethod
+    def detect_providers(cls, probe_ollama: bool = True) -> dict[str, bool]:
+        """Map every known provider to whether it is available."""
+        available = frozenset(cls.get_available_providers(probe_ollama))
+        return {provider: provider in available for provider, _ in cls.ENV_VARS}
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Forget the detected providers so the next call re-detects them."""
+        cls._env_providers = None
+        cls._ollama_running = None
+
     @staticmethod
     def _check_ollama_running() -> bool:
         """Check if Ollama is running locally."""
+        # A completed TCP handshake means the server is listening; no need
+        # to wait for it to enumerate models over HTTP
         try:
-            result = subprocess.run(
-                ["curl", "-s", "http://localhost:11434/api/tags"],
-                capture_output=True,
-                timeout=2,
-            )
-            return result.returncode == 0
-        except Exception:
+            with socket.create_connection(("127.0.0.1", 11434), timeout=0.1):
+                return True
+        except OSError:
             return False
 
-    @staticmethod
-    def get_available_providers() -> list[str]:
-        """Get list of available providers."""
-        available = ProviderDetector.detect_providers()
-        return [provider for provider, is_available in available.items() if is_available]
-
     @staticmethod
     def suggest_providers_setup(available: list[str]) -> None:
         """Suggest setting up providers for the first run."""
         if not available:
-            print("❌ No LLM providers detected!")
-            print("\nTo use this skill, you need to set up at least one provider:")
-            print("\n1. OpenAI:")
-            print("   export OPENAI_API_KEY='sk-...'")
-            print("\n2. Anthropic:")
-            print("   export ANTHROPIC_API_KEY='sk-ant-...'")
-            print("\n3. Google Gemini:")
-            print("   export GOOGLE_API_KEY='...'")
-            print("\n4. Ollama (local):")
-            print("   - Install from https://ollama.ai")
-            print("   - Run: ollama serve")
+            sys.stdout.write(_NO_PROVIDERS_HELP)
             return
 
-        print("✅ Available LLM Providers:")
-        for provider in available:
-            print(f"   • {provider.capitalize()}")
+        parts = ["✅ Available LLM Providers:\n"]
+        parts.extend(f"   • {provider.capitalize()}\n" for provider in available)
 
-        missing = [p for p in ProviderDetector.ENV_VARS.keys() if p not in available]
+        available_set = frozenset(available)
+        missing = [p for p, _ in ProviderDetector.ENV_VARS if p not in available_set]
         if missing:
-            print(f"\nYou can also set up: {', '.join(missing)}")
-            print("\n5. Groq (free, fast Llama models):")
-            print("   export GROQ_API_KEY='...'")
-            print("   Get key from: https://console.groq.com/keys")
-            print("\n6. OpenRouter (unified API for 200+ models):")
-            print("   export OPENROUTER_API_KEY='sk-or-...'")
-            print("   Get key from: https://openrouter.ai")
+            parts.append(f"\nYou can also set up: {', '.join(missing)}\n")
+            parts.append(_EXTRA_PROVIDERS_HELP)
+
+        sys.stdout.write("".join(parts))
@@ -6,36 +6,268 @@ Interactive commands for Telegram operations.
 import asyncio
 import json
 import os
+import re
 import sys
-from pathlib import Path
 
-# Add src to path for development
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Add src to path for development (plain os.path: pathlib isn't needed at startup)
+_SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 import argparse
+from functools import cache, lru_cache
 
-from telegram_telethon.core.config import Config, DaemonConfig, TriggerConfig, ClaudeConfig, DEFAULT_CONFIG_DIR
-from telegram_telethon.core.auth import AuthWizard, AuthStatus, verify_connection, AuthError
+# telegram_telethon.core.{config,auth} are imported by the commands that use
+# them: auth pulls in telethon, which --help and argument errors never need.
+
+
+@cache
+def _orjson():
+    """orjson module if installed (imported on first use), else None."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def _dumps_bytes(obj, pretty=False):
+    """Serialize obj to UTF-8 JSON, with orjson when available."""
+    orjson = _orjson()
+    if orjson is None:
+        if pretty:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()  # same bytes as orjson
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    return orjson.dumps(obj, option=option)
+
+
+def _dumps(obj, pretty=False):
+    """Serialize obj to a JSON string."""
+    return _dumps_bytes(obj, pretty).decode()
+
+
+def _emit(obj, pretty=False, out=None):
+    """Write obj to out (default stdout) as JSON followed by a newline.
+
+    The payload is encoded once and handed to the binary buffer in a single
+    write, skipping print()'s text layer; the buffer is flushed at exit.
+    """
+    out = sys.stdout if out is None else out
+    payload = _dumps_bytes(obj, pretty) + b"\n"
+    buffer = getattr(out, "buffer", None)
+    if buffer is None:  # text-only stream, e.g. a StringIO (serve mode)
+        out.write(payload.decode())
+        return
+    out.flush()  # keep order with anything already printed
+    buffer.write(payload)
+
+
+# Connected client owned by `tg.py serve`; commands it runs reuse it
+_SHARED_CLIENT = None
+
+
+@lru_cache(maxsize=4)
+def _load_config(path, mtime_ns):
+    """Parse config.yaml; mtime_ns is part of the cache key so edits are re-read."""
+    from pathlib import Path
+    from telegram_telethon.core.config import Config
+
+    return Config.load(Path(path))
+
+
+@cache
+def _config_path(name):
+    """Path of a file in the config directory, as a string."""
+    from telegram_telethon.core.config import DEFAULT_CONFIG_DIR
+
+    return os.path.join(str(DEFAULT_CONFIG_DIR), name)
+
+
+def get_config():
+    """Load the core config, parsing the YAML once per file version."""
+    path = _config_path("config.yaml")
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _load_config(path, mtime_ns)
 
 
 async def get_client():
     """Get authenticated Telegram client."""
+    if _SHARED_CLIENT is not None:
+        return _SHARED_CLIENT
+
     from telethon import TelegramClient
 
-    config = Config.load(DEFAULT_CONFIG_DIR / "config.yaml")
+    config = get_config()
     if not config.is_configured():
-        print(json.dumps({"error": "Not configured. Run: tg.py setup"}))
+        _emit({"error": "Not configured. Run: tg.py setup"})
         sys.exit(1)
 
-    session_path = DEFAULT_CONFIG_DIR / "session"
-    client = TelegramClient(str(session_path), config.api_id, config.api_hash)
+    client = TelegramClient(_config_path("session"), config.api_id, config.api_hash)
     await client.start()
     return client
 
 
+async def release_client(client):
+    """Disconnect a client from get_client(), unless it is the shared serve-mode client."""
+    if client is not _SHARED_CLIENT:
+        await client.disconnect()
+
+
+def default_socket_path():
+    """Default Unix socket path for `tg.py serve`."""
+    return _config_path("tg.sock")
+
+
+async def run_forwarded(request):
+    """Run one forwarded command with the shared client, capturing its output."""
+    import io
+
+    out = io.StringIO()
+    exit_code = 0
+    try:
+        await ASYNC_COMMANDS[request["cmd"]](argparse.Namespace(**request["args"]), out)
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        out.write(_dumps({"error": f"{type(e).__name__}: {e}"}) + "\n")
+        exit_code = 1
+    return {"output": out.getvalue(), "exit_code": exit_code}
+
+
+async def start_command_server(client, socket_path):
+    """Run commands sent over a Unix socket with an already connected client.
+
+    Protocol: one JSON line per connection, {"cmd": ..., "args": {...}},
+    answered with one JSON line {"output": ..., "exit_code": ...}.
+    Returns the started asyncio server; shut it down with stop_command_server().
+    """
+    global _SHARED_CLIENT
+
+    _SHARED_CLIENT = client
+
+    async def handle(reader, writer):
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                response = await run_forwarded(request)
+            except Exception as e:  # malformed request; the client still gets an answer
+                error = _dumps({"error": f"Bad request: {type(e).__name__}: {e}"})
+                response = {"output": error + "\n", "exit_code": 1}
+            writer.write(_dumps_bytes(response) + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # left behind by a server that didn't shut down cleanly
+    # The socket grants full access to the account: create it owner-only
+    old_umask = os.umask(0o177)
+    try:
+        return await asyncio.start_unix_server(handle, path=socket_path)
+    finally:
+        os.umask(old_umask)
+
+
+def stop_command_server(server, socket_path):
+    """Close a start_command_server() server and remove its socket."""
+    global _SHARED_CLIENT
+
+    server.close()
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    _SHARED_CLIENT = None
+
+
+async def serve(socket_path):
+    """Keep one authenticated client connected and run commands sent over a Unix socket."""
+    client = await get_client()
+    server = await start_command_server(client, socket_path)
+
+    print(_dumps({"status": "serving", "socket": socket_path}), flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        stop_command_server(server, socket_path)
+        await client.disconnect()
+
+
+# Arguments of ASYNC_COMMANDS that name files or directories
+_PATH_ARGS = ("output", "file")
+
+
+def forward_command(socket_path, command, args):
+    """Run a command in a `tg.py serve` or `tgd.py start` process; returns False if none is listening."""
+    import socket
+
+    args = dict(vars(args))
+    # The server runs in its own working directory
+    for key in _PATH_ARGS:
+        if args.get(key):
+            args[key] = os.path.abspath(args[key])
+    request = {"cmd": command, "args": args}
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+    except OSError:
+        return False
+
+    with sock:
+        try:
+            sock.sendall(_dumps_bytes(request) + b"\n")
+            with sock.makefile("rb") as f:
+                response = json.loads(f.readline())
+        except (OSError, ValueError):
+            # The server may already have run the command (e.g. sent a
+            # message), so running it again locally is not safe
+            _emit({"error": f"No reply from command server at {socket_path}"})
+            sys.exit(1)
+
+    sys.stdout.write(response["output"])
+    sys.exit(response["exit_code"])
+
+
+def run_async(coro):
+    """Run a coroutine to completion, on uvloop's event loop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
+_INTERACTIVE = None
+
+
 def is_interactive():
-    """Check if running in interactive TTY mode."""
-    return sys.stdin.isatty() and sys.stdout.isatty()
+    """Check if running in interactive TTY mode.
+
+    The answer is computed once per process. Set TG_FORCE_NONINTERACTIVE=1
+    to always take the non-interactive (JSON) path.
+    """
+    global _INTERACTIVE
+    if _INTERACTIVE is None:
+        _INTERACTIVE = (
+            os.environ.get("TG_FORCE_NONINTERACTIVE") != "1"
+            and sys.stdin.isatty()
+            and sys.stdout.isatty()
+        )
+    return _INTERACTIVE
+
+
+def _prompt_until_valid(console, label, validator, error_msg):
+    """Prompt until validator accepts the answer, printing error_msg on each rejection."""
+    from rich.prompt import Prompt
+
+    while True:
+        value = Prompt.ask(label)
+        if validator(value):
+            return value
+        console.print(f"[red]{error_msg}[/red]")
 
 
 def print_qr_terminal(url: str) -> None:
@@ -56,8 +288,18 @@ def print_qr_terminal(url: str) -> None:
     qr.add_data(url)
     qr.make(fit=True)
 
-    # Print using unicode blocks for compact terminal display
-    qr.print_ascii(invert=True)
+    # Print using unicode half blocks, two module rows per line, inverted the
+    # same way as qr.print_ascii(invert=True) but emitted with a single write
+    # instead of one per module
+    matrix = qr.get_matrix()  # includes the border
+    if len(matrix) % 2:
+        matrix.append([True] * len(matrix[0]))  # blank half-row below the border
+    blocks = ("█", "▄", "▀", "\xa0")  # indexed by top + 2 * bottom
+    lines = [
+        "".join(blocks[top + 2 * bottom] for top, bottom in zip(upper, lower))
+        for upper, lower in zip(matrix[::2], matrix[1::2])
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def setup_qr(api_id=None, api_hash=None):
@@ -65,16 +307,20 @@ def setup_qr(api_id=None, api_hash=None):
 
     Useful when verification codes don't arrive via phone.
     """
-    try:
-        from rich.console import Console
-        from rich.panel import Panel
-        from rich.prompt import Prompt
-    except ImportError:
-        print("Install dependencies: pip install rich")
-        sys.exit(1)
-
-    console = Console()
     interactive = is_interactive()
+    console = None
+    if interactive:
+        # rich is only needed for prompts; automation runs skip loading it
+        try:
+            from rich.console import Console
+            from rich.panel import Panel
+        except ImportError:
+            print("Install dependencies: pip install rich")
+            sys.exit(1)
+        console = Console()
+    from telegram_telethon.core.auth import AuthWizard, AuthError
+    from telegram_telethon.core.config import DEFAULT_CONFIG_DIR
+
     wizard = AuthWizard()
 
     # Step 1: Get API credentials
@@ -84,35 +330,30 @@ def setup_qr(api_id=None, api_hash=None):
             border_style="green",
         ))
 
-        console.print("\n[bold]Step 1/2: API Credentials[/bold]")
-        console.print("─" * 40)
+        console.print("\n[bold]Step 1/2: API Credentials[/bold]\n" + "─" * 40)
 
         if not api_id:
-            while True:
-                api_id = Prompt.ask("Enter your api_id")
-                if wizard.validate_api_id(api_id):
-                    break
-                console.print("[red]Invalid API ID - must be numeric[/red]")
+            api_id = _prompt_until_valid(
+                console, "Enter your api_id", wizard.validate_api_id, "Invalid API ID - must be numeric"
+            )
 
         if not api_hash:
-            while True:
-                api_hash = Prompt.ask("Enter your api_hash")
-                if wizard.validate_api_hash(api_hash):
-                    break
-                console.print("[red]Invalid API hash - must be 32 hex characters[/red]")
+            api_hash = _prompt_until_valid(
+                console, "Enter your api_hash", wizard.validate_api_hash, "Invalid API hash - must be 32 hex characters"
+            )
     else:
         if not api_id or not api_hash:
-            print(json.dumps({
+            _emit({
                 "error": "Non-interactive QR login requires --api-id and --api-hash",
-            }))
+            })
             sys.exit(1)
 
         if not wizard.validate_api_id(str(api_id)):
-            print(json.dumps({"error": "Invalid API ID - must be numeric"}))
+            _emit({"error": "Invalid API ID - must be numeric"})
             sys.exit(1)
 
         if not wizard.validate_api_hash(api_hash):
-            print(json.dumps({"error": "Invalid API hash - must be 32 hex characters"}))
+            _emit({"error": "Invalid API hash - must be 32 hex characters"})
             sys.exit(1)
 
     wizard.set_credentials(str(api_id), api_hash)
@@ -120,11 +361,13 @@ def setup_qr(api_id=None, api_hash=None):
     async def do_qr_auth():
         try:
             if interactive:
-                console.print("\n[bold]Step 2/2: Scan QR Code[/bold]")
-                console.print("─" * 40)
-                console.print("1. Open Telegram on your phone")
-                console.print("2. Go to Settings → Devices → Link Desktop Device")
-                console.print("3. Scan the QR code below\n")
+                console.print("\n".join([
+                    "\n[bold]Step 2/2: Scan QR Code[/bold]",
+                    "─" * 40,
+                    "1. Open Telegram on your phone",
+                    "2. Go to Settings → Devices → Link Desktop Device",
+                    "3. Scan the QR code below\n",
+                ]))
 
             qr_url, expires_in = await wizard.start_qr_login()
 
@@ -132,12 +375,12 @@ def setup_qr(api_id=None, api_hash=None):
                 print_qr_terminal(qr_url)
                 console.print(f"\n[dim]Expires in {expires_in}s. Waiting for scan...[/dim]")
             else:
-                print(json.dumps({
+                _emit({
                     "status": "qr_ready",
                     "qr_url": qr_url,
                     "expires_in": expires_in,
                     "instructions": "Scan with Telegram: Settings → Devices → Link Desktop Device"
-                }))
+                })
 
             user = await wizard.wait_for_qr_login(timeout=120)
             return user
@@ -148,27 +391,29 @@ def setup_qr(api_id=None, api_hash=None):
             await wizard.disconnect()
 
     try:
-        user = asyncio.run(do_qr_auth())
+        user = run_async(do_qr_auth())
     except Exception as e:
         if interactive:
             console.print(f"[red]QR Authentication failed: {e}[/red]")
         else:
-            print(json.dumps({"error": f"QR authentication failed: {e}"}))
+            _emit({"error": f"QR authentication failed: {e}"})
         sys.exit(1)
 
     if interactive:
-        console.print(f"\n[green]✓[/green] Connected as: {user.first_name} (@{getattr(user, 'username', 'N/A')})")
-        console.print(f"[green]✓[/green] Config saved to: {DEFAULT_CONFIG_DIR}")
-        console.print("\n[bold green]Ready![/bold green] Try: tg.py list")
+        console.print("\n".join([
+            f"\n[green]✓[/green] Connected as: {user.first_name} (@{getattr(user, 'username', 'N/A')})",
+            f"[green]✓[/green] Config saved to: {DEFAULT_CONFIG_DIR}",
+            "\n[bold green]Ready![/bold green] Try: tg.py list",
+        ]))
     else:
-        print(json.dumps({
+        _emit({
             "status": "success",
             "connected_as": {
                 "first_name": user.first_name,
                 "username": getattr(user, 'username', None),
             },
             "config_dir": str(DEFAULT_CONFIG_DIR)
-        }))
+        })
 
 
 def setup_wizard(api_id=None, api_hash=None, phone=None, code=None, password=None, use_qr=False):
@@ -185,16 +430,21 @@ def setup_wizard(api_id=None, api_hash=None, phone=None, code=None, password=Non
         setup_qr(api_id=api_id, api_hash=api_hash)
         return
 
-    try:
-        from rich.console import Console
-        from rich.panel import Panel
-        from rich.prompt import Prompt, Confirm
-    except ImportError:
-        print("Install dependencies: pip install rich questionary")
-        sys.exit(1)
-
-    console = Console()
     interactive = is_interactive()
+    console = None
+    if interactive:
+        # rich is only needed for prompts; automation runs skip loading it
+        try:
+            from rich.console import Console
+            from rich.panel import Panel
+            from rich.prompt import Prompt, Confirm
+        except ImportError:
+            print("Install dependencies: pip install rich questionary")
+            sys.exit(1)
+        console = Console()
+    from telegram_telethon.core.auth import AuthWizard, Auth2FARequired
+    from telegram_telethon.core.config import DEFAULT_CONFIG_DIR
+
     wizard = AuthWizard()
 
     # Step 1: Get API credentials
@@ -204,56 +454,51 @@ def setup_wizard(api_id=None, api_hash=None, phone=None, code=None, password=Non
             border_style="blue",
         ))
 
-        console.print("\n[bold]Step 1/4: Get API Credentials[/bold]")
-        console.print("─" * 40)
-        console.print("1. Open: [link]https://my.telegram.org/auth[/link]")
-        console.print("2. Log in with your phone number")
-        console.print("3. Click 'API development tools'")
-        console.print("4. Create new application (any name works)\n")
-
-        while True:
-            api_id = Prompt.ask("Enter your api_id")
-            if wizard.validate_api_id(api_id):
-                break
-            console.print("[red]Invalid API ID - must be numeric[/red]")
-
-        while True:
-            api_hash = Prompt.ask("Enter your api_hash")
-            if wizard.validate_api_hash(api_hash):
-                break
-            console.print("[red]Invalid API hash - must be 32 hex characters[/red]")
+        console.print("\n".join([
+            "\n[bold]Step 1/4: Get API Credentials[/bold]",
+            "─" * 40,
+            "1. Open: [link]https://my.telegram.org/auth[/link]",
+            "2. Log in with your phone number",
+            "3. Click 'API development tools'",
+            "4. Create new application (any name works)\n",
+        ]))
+
+        api_id = _prompt_until_valid(
+            console, "Enter your api_id", wizard.validate_api_id, "Invalid API ID - must be numeric"
+        )
+
+        api_hash = _prompt_until_valid(
+            console, "Enter your api_hash", wizard.validate_api_hash, "Invalid API hash - must be 32 hex characters"
+        )
     else:
         # Non-interactive: require CLI args
         if not api_id or not api_hash or not phone:
-            print(json.dumps({
+            _emit({
                 "error": "Non-interactive mode requires --api-id, --api-hash, and --phone",
                 "hint": "Run interactively in a terminal, or provide all credentials via flags"
-            }))
+            })
             sys.exit(1)
 
         if not wizard.validate_api_id(str(api_id)):
-            print(json.dumps({"error": "Invalid API ID - must be numeric"}))
+            _emit({"error": "Invalid API ID - must be numeric"})
             sys.exit(1)
 
         if not wizard.validate_api_hash(api_hash):
-            print(json.dumps({"error": "Invalid API hash - must be 32 hex characters"}))
+            _emit({"error": "Invalid API hash - must be 32 hex characters"})
             sys.exit(1)
 
     wizard.set_credentials(str(api_id), api_hash)
 
     # Step 2: Phone number
     if interactive:
-        console.print("\n[bold]Step 2/4: Phone Authentication[/bold]")
-        console.print("─" * 40)
-
-        while True:
-            phone = Prompt.ask("Phone number (with country code, e.g. +1234567890)")
-            if wizard.validate_phone(phone):
-                break
-            console.print("[red]Invalid phone - must start with + and contain digits[/red]")
+        console.print("\n[bold]Step 2/4: Phone Authentication[/bold]\n" + "─" * 40)
+
+        phone = _prompt_until_valid(
+            console, "Phone number (with country code, e.g. +1234567890)", wizard.validate_phone, "Invalid phone - must start with + and contain digits"
+        )
     else:
         if not wizard.validate_phone(phone):
-            print(json.dumps({"error": "Invalid phone - must start with + and contain digits"}))
+            _emit({"error": "Invalid phone - must start with + and contain digits"})
             sys.exit(1)
 
     wizard.set_phone(phone)
@@ -272,43 +517,40 @@ def setup_wizard(api_id=None, api_hash=None, phone=None, code=None, password=Non
             else:
                 if not code:
                     # Save config so user can complete auth later
-                    print(json.dumps({
+                    _emit({
                         "status": "code_sent",
                         "message": "Verification code sent to phone. Re-run with --code to complete.",
                         "next_step": f"python3 scripts/tg.py setup --api-id {api_id} --api-hash {api_hash} --phone {phone} --code YOUR_CODE"
-                    }))
+                    })
                     return None
 
             try:
                 user = await wizard.sign_in(code)
                 return user
-            except Exception as e:
-                if "2FA" in str(e):
-                    if interactive:
-                        console.print("\n[bold]Step 3/4: Two-Factor Auth[/bold]")
-                        console.print("─" * 40)
-                        password = Prompt.ask("Enter your 2FA password", password=True)
-                    else:
-                        if not password:
-                            print(json.dumps({
-                                "status": "2fa_required",
-                                "message": "2FA password required. Re-run with --password flag.",
-                                "next_step": f"python3 scripts/tg.py setup --api-id {api_id} --api-hash {api_hash} --phone {phone} --code {code} --password YOUR_PASSWORD"
-                            }))
-                            return None
-                    user = await wizard.sign_in_2fa(password)
-                    return user
-                raise
+            except Auth2FARequired:
+                if interactive:
+                    console.print("\n[bold]Step 3/4: Two-Factor Auth[/bold]\n" + "─" * 40)
+                    password = Prompt.ask("Enter your 2FA password", password=True)
+                else:
+                    if not password:
+                        _emit({
+                            "status": "2fa_required",
+                            "message": "2FA password required. Re-run with --password flag.",
+                            "next_step": f"python3 scripts/tg.py setup --api-id {api_id} --api-hash {api_hash} --phone {phone} --code {code} --password YOUR_PASSWORD"
+                        })
+                        return None
+                user = await wizard.sign_in_2fa(password)
+                return user
         finally:
             await wizard.disconnect()
 
     try:
-        user = asyncio.run(do_auth())
+        user = run_async(do_auth())
     except Exception as e:
         if interactive:
             console.print(f"[red]Authentication failed: {e}[/red]")
         else:
-            print(json.dumps({"error": f"Authentication failed: {e}"}))
+            _emit({"error": f"Authentication failed: {e}"})
         sys.exit(1)
 
     if user is None:
@@ -316,23 +558,29 @@ def setup_wizard(api_id=None, api_hash=None, phone=None, code=None, password=Non
         return
 
     if interactive:
-        console.print("\n[bold]Step 4/4: Verify Connection[/bold]")
-        console.print("─" * 40)
-        console.print(f"[green]✓[/green] Connected as: {user.first_name} (@{user.username})")
-        console.print(f"[green]✓[/green] Config saved to: {DEFAULT_CONFIG_DIR}")
-        console.print("\n[bold green]Ready![/bold green] Try: tg.py list")
+        console.print("\n".join([
+            "\n[bold]Step 4/4: Verify Connection[/bold]",
+            "─" * 40,
+            f"[green]✓[/green] Connected as: {user.first_name} (@{user.username})",
+            f"[green]✓[/green] Config saved to: {DEFAULT_CONFIG_DIR}",
+            "\n[bold green]Ready![/bold green] Try: tg.py list",
+        ]))
 
         if Confirm.ask("\nWould you like to configure the daemon now?"):
             setup_daemon_config(console)
     else:
-        print(json.dumps({
+        _emit({
             "status": "success",
             "connected_as": {
                 "first_name": user.first_name,
                 "username": user.username,
             },
             "config_dir": str(DEFAULT_CONFIG_DIR)
-        }))
+        })
+
+
+# Separator for the comma-separated tool list, absorbing surrounding spaces
+_TOOLS_SPLIT_RE = re.compile(r"\s*,\s*")
 
 
 def setup_daemon_config(console=None):
@@ -343,12 +591,12 @@ def setup_daemon_config(console=None):
     except ImportError:
         print("Install dependencies: pip install rich")
         sys.exit(1)
+    from telegram_telethon.core.config import DaemonConfig, TriggerConfig, ClaudeConfig, DEFAULT_CONFIG_DIR
 
     if console is None:
         console = Console()
 
-    console.print("\n[bold]Daemon Configuration[/bold]")
-    console.print("─" * 40)
+    console.print("\n[bold]Daemon Configuration[/bold]\n" + "─" * 40)
 
     triggers = []
 
@@ -377,7 +625,7 @@ def setup_daemon_config(console=None):
 
     console.print("\n[bold]Claude Configuration[/bold]")
     tools_input = Prompt.ask("Allowed tools (comma-separated)", default="Read,Edit,Bash,WebFetch")
-    allowed_tools = [t.strip() for t in tools_input.split(",") if t.strip()]
+    allowed_tools = [t for t in _TOOLS_SPLIT_RE.split(tools_input.strip()) if t]
     max_turns = int(Prompt.ask("Max turns per request", default="10"))
     timeout = int(Prompt.ask("Timeout in seconds", default="300"))
 
@@ -391,22 +639,28 @@ def setup_daemon_config(console=None):
     console.print(f"\n[green]✓[/green] Daemon config saved to: {config_path}")
 
 
-def show_status():
-    """Show current status."""
+def show_status(quick=False):
+    """Show current status.
+
+    With quick=True only the local config and session are checked; the
+    Telegram connection is not tested.
+    """
+    from telegram_telethon.core.auth import AuthStatus, verify_connection
+
     status = AuthStatus.check()
     print(f"Config directory: {status.config_dir}")
     print(f"State: {status.state}")
     print(f"Ready: {status.is_ready}")
 
-    if status.is_ready:
-        result = asyncio.run(verify_connection())
+    if status.is_ready and not quick:
+        result = run_async(verify_connection())
         if result.get("connected"):
             print(f"Connected as: {result.get('first_name')} (@{result.get('username')})")
         else:
             print(f"Connection error: {result.get('error')}")
 
 
-async def cmd_list(args):
+async def cmd_list(args, out):
     """List chats."""
     from telegram_telethon.modules.messages import list_chats
     from telegram_telethon.utils.formatting import format_chats_table
@@ -415,14 +669,14 @@ async def cmd_list(args):
     try:
         chats = await list_chats(client, limit=args.limit, search=args.search)
         if args.json:
-            print(json.dumps(chats, indent=2, ensure_ascii=False))
+            _emit(chats, pretty=True, out=out)
         else:
-            print(format_chats_table(chats))
+            print(format_chats_table(chats), file=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_recent(args):
+async def cmd_recent(args, out):
     """Fetch recent messages."""
     from telegram_telethon.modules.messages import fetch_recent
     from telegram_telethon.utils.formatting import format_output, append_to_daily, append_to_person, save_to_file
@@ -437,20 +691,20 @@ async def cmd_recent(args):
 
         if args.output:
             result = save_to_file(messages, args.output, output_fmt)
-            print(json.dumps(result, indent=2, ensure_ascii=False))
+            _emit(result, pretty=True, out=out)
         elif args.to_daily:
             path = append_to_daily(format_output(messages, output_fmt))
-            print(f"Appended to {path}")
+            print(f"Appended to {path}", file=out)
         elif args.to_person:
             path = append_to_person(format_output(messages, output_fmt), args.to_person)
-            print(f"Appended to {path}")
+            print(f"Appended to {path}", file=out)
         else:
-            print(format_output(messages, output_fmt))
+            print(format_output(messages, output_fmt), file=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_search(args):
+async def cmd_search(args, out):
     """Search messages."""
     from telegram_telethon.modules.messages import search_messages
     from telegram_telethon.utils.formatting import format_output, append_to_daily, save_to_file
@@ -465,17 +719,17 @@ async def cmd_search(args):
 
         if args.output:
             result = save_to_file(messages, args.output, output_fmt)
-            print(json.dumps(result, indent=2, ensure_ascii=False))
+            _emit(result, pretty=True, out=out)
         elif args.to_daily:
             path = append_to_daily(format_output(messages, output_fmt))
-            print(f"Appended to {path}")
+            print(f"Appended to {path}", file=out)
         else:
-            print(format_output(messages, output_fmt))
+            print(format_output(messages, output_fmt), file=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_unread(args):
+async def cmd_unread(args, out):
     """Fetch unread messages."""
     from telegram_telethon.modules.messages import fetch_unread
     from telegram_telethon.utils.formatting import format_output, append_to_daily
@@ -487,14 +741,14 @@ async def cmd_unread(args):
 
         if args.to_daily:
             path = append_to_daily(format_output(messages, output_fmt))
-            print(f"Appended to {path}")
+            print(f"Appended to {path}", file=out)
         else:
-            print(format_output(messages, output_fmt))
+            print(format_output(messages, output_fmt), file=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_thread(args):
+async def cmd_thread(args, out):
     """Fetch thread messages."""
     from telegram_telethon.modules.messages import fetch_thread
     from telegram_telethon.utils.formatting import format_output, save_to_file
@@ -506,20 +760,20 @@ async def cmd_thread(args):
 
         if args.output:
             result = save_to_file(messages, args.output, output_fmt)
-            print(json.dumps(result, indent=2, ensure_ascii=False))
+            _emit(result, pretty=True, out=out)
         else:
-            print(format_output(messages, output_fmt))
+            print(format_output(messages, output_fmt), file=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_send(args):
+async def cmd_send(args, out):
     """Send a message."""
     from telegram_telethon.modules.messages import send_message
 
     client = await get_client()
     try:
-        config = Config.load(DEFAULT_CONFIG_DIR / "config.yaml")
+        config = get_config()
         allowed_groups = config.allowed_send_groups
 
         reply_to = args.topic if args.topic else args.reply_to
@@ -527,12 +781,12 @@ async def cmd_send(args):
             client, chat_name=args.chat, text=args.text or "",
             reply_to=reply_to, file_path=args.file, allowed_groups=allowed_groups,
         )
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        _emit(result, pretty=True, out=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_delete(args):
+async def cmd_delete(args, out):
     """Delete messages."""
     from telegram_telethon.modules.messages import delete_messages
 
@@ -542,12 +796,12 @@ async def cmd_delete(args):
             client, chat_name=args.chat, message_ids=args.message_ids,
             revoke=not args.no_revoke,
         )
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        _emit(result, pretty=True, out=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_forward(args):
+async def cmd_forward(args, out):
     """Forward messages."""
     from telegram_telethon.modules.messages import forward_messages
 
@@ -557,36 +811,36 @@ async def cmd_forward(args):
             client, from_chat=args.from_chat, to_chat=args.to_chat,
             message_ids=args.message_ids,
         )
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        _emit(result, pretty=True, out=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_mark_read(args):
+async def cmd_mark_read(args, out):
     """Mark messages as read."""
     from telegram_telethon.modules.messages import mark_read
 
     client = await get_client()
     try:
         result = await mark_read(client, chat_name=args.chat, max_id=args.max_id)
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        _emit(result, pretty=True, out=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_edit(args):
+async def cmd_edit(args, out):
     """Edit a message."""
     from telegram_telethon.modules.messages import edit_message
 
     client = await get_client()
     try:
         result = await edit_message(client, chat_name=args.chat, message_id=args.message_id, text=args.text)
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        _emit(result, pretty=True, out=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_download(args):
+async def cmd_download(args, out):
     """Download media."""
     from telegram_telethon.modules.media import download_media
 
@@ -597,12 +851,12 @@ async def cmd_download(args):
             output_dir=args.output, message_id=args.message_id,
             media_type=args.type,
         )
-        print(json.dumps(results, indent=2, ensure_ascii=False))
+        _emit(results, pretty=True, out=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_transcribe(args):
+async def cmd_transcribe(args, out):
     """Transcribe voice messages."""
     from telegram_telethon.modules.media import transcribe_voice, transcribe_batch
 
@@ -615,23 +869,24 @@ async def cmd_transcribe(args):
                 client, chat_name=args.chat, message_id=args.message_id,
                 fallback_method=args.fallback, groq_api_key=groq_key,
             )
-            print(json.dumps({
+            _emit({
                 "success": result.success,
                 "text": result.text,
                 "method": result.method,
                 "error": result.error,
-            }, indent=2, ensure_ascii=False))
+            }, pretty=True, out=out)
         else:
             results = await transcribe_batch(
                 client, chat_name=args.chat, limit=args.limit,
                 fallback_method=args.fallback, groq_api_key=groq_key,
+                concurrency=args.concurrency,
             )
-            print(json.dumps(results, indent=2, ensure_ascii=False))
+            _emit(results, pretty=True, out=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_draft(args):
+async def cmd_draft(args, out):
     """Handle draft command - save, clear single, or clear all."""
     from telegram_telethon.modules.messages import save_draft, clear_all_drafts
 
@@ -650,12 +905,12 @@ async def cmd_draft(args):
             )
         else:
             result = {"error": "Specify --chat and --text, or use --clear-all"}
-        print(json.dumps(result, indent=2))
+        _emit(result, pretty=True, out=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_drafts(args):
+async def cmd_drafts(args, out):
     """Handle drafts command - list all drafts."""
     from telegram_telethon.modules.messages import get_all_drafts
 
@@ -663,32 +918,72 @@ async def cmd_drafts(args):
     try:
         # Pass limit to function for early termination (avoids unnecessary iteration)
         drafts = await get_all_drafts(client, limit=args.limit)
-        print(json.dumps(drafts, indent=2))
+        _emit(drafts, pretty=True, out=out)
     finally:
-        await client.disconnect()
+        await release_client(client)
 
 
-async def cmd_draft_send(args):
+async def cmd_draft_send(args, out):
     """Handle draft-send command."""
     from telegram_telethon.modules.messages import send_draft
 
     client = await get_client()
     try:
-        config = Config.load(DEFAULT_CONFIG_DIR / "config.yaml")
+        config = get_config()
         allowed_groups = config.allowed_send_groups
 
         result = await send_draft(client, args.chat, allowed_groups=allowed_groups)
-        print(json.dumps(result, indent=2))
+        _emit(result, pretty=True, out=out)
     finally:
-        await client.disconnect()
-
-
-def main():
-    parser = argparse.ArgumentParser(description="Telegram Telethon CLI")
-    subparsers = parser.add_subparsers(dest="command", required=True)
-
-    # Setup
-    setup_p = subparsers.add_parser("setup", help="Run setup wizard")
+        await release_client(client)
+
+
+# Subcommands that talk to Telegram (and can be forwarded to `tg.py serve`),
+# called as fn(args, out) with out the text stream their results go to
+ASYNC_COMMANDS = {
+    "list": cmd_list,
+    "recent": cmd_recent,
+    "search": cmd_search,
+    "unread": cmd_unread,
+    "thread": cmd_thread,
+    "send": cmd_send,
+    "edit": cmd_edit,
+    "delete": cmd_delete,
+    "forward": cmd_forward,
+    "mark-read": cmd_mark_read,
+    "download": cmd_download,
+    "transcribe": cmd_transcribe,
+    "draft": cmd_draft,
+    "drafts": cmd_drafts,
+    "draft-send": cmd_draft_send,
+}
+
+
+# Subcommand -> help text, in --help order
+COMMANDS = {
+    "setup": "Run setup wizard",
+    "status": "Show connection status",
+    "daemon-config": "Configure daemon triggers",
+    "list": "List chats",
+    "recent": "Fetch recent messages",
+    "search": "Search messages",
+    "unread": "Fetch unread messages",
+    "thread": "Fetch forum thread",
+    "send": "Send message",
+    "edit": "Edit message",
+    "delete": "Delete messages",
+    "forward": "Forward messages",
+    "mark-read": "Mark messages as read",
+    "download": "Download media",
+    "transcribe": "Transcribe voice messages",
+    "draft": "Manage draft messages",
+    "drafts": "List all drafts",
+    "draft-send": "Send draft as message",
+    "serve": "Keep a connection open for other tg.py invocations",
+}
+
+
+def _build_setup_parser(setup_p):
     setup_p.add_argument("--api-id", type=int, help="Telegram API ID (for non-interactive)")
     setup_p.add_argument("--api-hash", help="Telegram API hash (for non-interactive)")
     setup_p.add_argument("--phone", help="Phone number with country code (for non-interactive)")
@@ -696,17 +991,18 @@ def main():
     setup_p.add_argument("--password", help="2FA password if enabled")
     setup_p.add_argument("--qr", action="store_true", help="Use QR code login instead of phone verification")
 
-    subparsers.add_parser("status", help="Show connection status")
-    subparsers.add_parser("daemon-config", help="Configure daemon triggers")
 
-    # List chats
-    list_p = subparsers.add_parser("list", help="List chats")
+def _build_status_parser(status_p):
+    status_p.add_argument("--quick", action="store_true", help="Check local config only, without connecting")
+
+
+def _build_list_parser(list_p):
     list_p.add_argument("--limit", type=int, default=30, help="Max chats")
     list_p.add_argument("--search", help="Filter by name")
     list_p.add_argument("--json", action="store_true", help="JSON output")
 
-    # Recent messages
-    recent_p = subparsers.add_parser("recent", help="Fetch recent messages")
+
+def _build_recent_parser(recent_p):
     recent_p.add_argument("--chat", help="Chat name")
     recent_p.add_argument("--chat-id", type=int, help="Chat ID")
     recent_p.add_argument("--limit", type=int, default=50, help="Max messages")
@@ -716,8 +1012,8 @@ def main():
     recent_p.add_argument("--to-person", help="Append to person's note")
     recent_p.add_argument("-o", "--output", help="Save to file")
 
-    # Search
-    search_p = subparsers.add_parser("search", help="Search messages")
+
+def _build_search_parser(search_p):
     search_p.add_argument("query", help="Search query")
     search_p.add_argument("--chat", help="Chat name")
     search_p.add_argument("--chat-id", type=int, help="Chat ID")
@@ -726,69 +1022,71 @@ def main():
     search_p.add_argument("--to-daily", action="store_true", help="Append to daily note")
     search_p.add_argument("-o", "--output", help="Save to file")
 
-    # Unread
-    unread_p = subparsers.add_parser("unread", help="Fetch unread messages")
+
+def _build_unread_parser(unread_p):
     unread_p.add_argument("--chat-id", type=int, help="Limit to chat")
     unread_p.add_argument("--json", action="store_true", help="JSON output")
     unread_p.add_argument("--to-daily", action="store_true", help="Append to daily note")
 
-    # Thread
-    thread_p = subparsers.add_parser("thread", help="Fetch forum thread")
+
+def _build_thread_parser(thread_p):
     thread_p.add_argument("--chat-id", type=int, required=True, help="Chat ID")
     thread_p.add_argument("--thread-id", type=int, required=True, help="Thread ID")
     thread_p.add_argument("--limit", type=int, default=100, help="Max messages")
     thread_p.add_argument("--json", action="store_true", help="JSON output")
     thread_p.add_argument("-o", "--output", help="Save to file")
 
-    # Send
-    send_p = subparsers.add_parser("send", help="Send message")
+
+def _build_send_parser(send_p):
     send_p.add_argument("--chat", required=True, help="Chat name, @username, or ID")
     send_p.add_argument("--text", help="Message text")
     send_p.add_argument("--file", help="File to send")
     send_p.add_argument("--reply-to", type=int, help="Reply to message ID")
     send_p.add_argument("--topic", type=int, help="Forum topic ID")
 
-    # Edit
-    edit_p = subparsers.add_parser("edit", help="Edit message")
+
+def _build_edit_parser(edit_p):
     edit_p.add_argument("--chat", required=True, help="Chat")
     edit_p.add_argument("--message-id", type=int, required=True, help="Message ID")
     edit_p.add_argument("--text", required=True, help="New text")
 
-    # Delete
-    del_p = subparsers.add_parser("delete", help="Delete messages")
+
+def _build_delete_parser(del_p):
     del_p.add_argument("--chat", required=True, help="Chat")
     del_p.add_argument("--message-ids", type=int, nargs="+", required=True, help="Message IDs to delete")
     del_p.add_argument("--no-revoke", action="store_true", help="Don't delete for everyone")
 
-    # Forward
-    fwd_p = subparsers.add_parser("forward", help="Forward messages")
+
+def _build_forward_parser(fwd_p):
     fwd_p.add_argument("--from", dest="from_chat", required=True, help="Source chat")
     fwd_p.add_argument("--to", dest="to_chat", required=True, help="Destination chat")
     fwd_p.add_argument("--message-ids", type=int, nargs="+", required=True, help="Message IDs")
 
-    # Mark read
-    read_p = subparsers.add_parser("mark-read", help="Mark messages as read")
+
+def _build_mark_read_parser(read_p):
     read_p.add_argument("--chat", required=True, help="Chat")
     read_p.add_argument("--max-id", type=int, help="Mark up to this message ID")
 
-    # Download
-    dl_p = subparsers.add_parser("download", help="Download media")
+
+def _build_download_parser(dl_p):
     dl_p.add_argument("--chat", required=True, help="Chat")
     dl_p.add_argument("--limit", type=int, default=5, help="Max files")
     dl_p.add_argument("--output", "-o", help="Output directory")
     dl_p.add_argument("--message-id", type=int, help="Specific message")
     dl_p.add_argument("--type", choices=["voice", "video", "photo", "document"], help="Filter by type")
 
-    # Transcribe
-    tr_p = subparsers.add_parser("transcribe", help="Transcribe voice messages")
+
+def _build_transcribe_parser(tr_p):
     tr_p.add_argument("--chat", required=True, help="Chat")
     tr_p.add_argument("--message-id", type=int, help="Specific message (omit for batch)")
     tr_p.add_argument("--limit", type=int, default=10, help="Max messages for batch")
     tr_p.add_argument("--fallback", choices=["groq", "whisper", "none"], default="groq", help="Fallback method")
     tr_p.add_argument("--groq-key", help="Groq API key (or set GROQ_API_KEY)")
+    tr_p.add_argument("--concurrency", type=int, default=4, help="Max transcriptions at once in batch mode")
+
 
+def _build_draft_parser(draft_p):
     # Draft - save/update/clear draft
-    draft_p = subparsers.add_parser("draft", help="Manage draft messages")
     draft_p.add_argument("--chat", help="Chat name/username/ID")
     draft_p.add_argument("--text", help="Draft text (empty string clears draft)")
     draft_p.add_argument("--reply-to", type=int, help="Message ID to reply to")
@@ -796,59 +1094,134 @@ def main():
     draft_p.add_argument("--overwrite", action="store_true", help="Replace existing draft instead of appending")
     draft_p.add_argument("--clear-all", action="store_true", help="Clear all drafts")
 
+
+def _build_drafts_parser(drafts_p):
     # Drafts - list all drafts
-    drafts_p = subparsers.add_parser("drafts", help="List all drafts")
     drafts_p.add_argument("--limit", type=int, default=50, help="Max drafts to show")
 
+
+def _build_draft_send_parser(draft_send_p):
     # Draft-send - send draft as message
-    draft_send_p = subparsers.add_parser("draft-send", help="Send draft as message")
     draft_send_p.add_argument("--chat", required=True, help="Chat to send draft from")
 
-    args = parser.parse_args()
 
-    if args.command == "setup":
-        setup_wizard(
-            api_id=args.api_id,
-            api_hash=args.api_hash,
-            phone=args.phone,
-            code=args.code,
-            password=args.password,
-            use_qr=args.qr,
-        )
-    elif args.command == "status":
-        show_status()
-    elif args.command == "daemon-config":
-        setup_daemon_config()
-    elif args.command == "list":
-        asyncio.run(cmd_list(args))
-    elif args.command == "recent":
-        asyncio.run(cmd_recent(args))
-    elif args.command == "search":
-        asyncio.run(cmd_search(args))
-    elif args.command == "unread":
-        asyncio.run(cmd_unread(args))
-    elif args.command == "thread":
-        asyncio.run(cmd_thread(args))
-    elif args.command == "send":
-        asyncio.run(cmd_send(args))
-    elif args.command == "edit":
-        asyncio.run(cmd_edit(args))
-    elif args.command == "delete":
-        asyncio.run(cmd_delete(args))
-    elif args.command == "forward":
-        asyncio.run(cmd_forward(args))
-    elif args.command == "mark-read":
-        asyncio.run(cmd_mark_read(args))
-    elif args.command == "download":
-        asyncio.run(cmd_download(args))
-    elif args.command == "transcribe":
-        asyncio.run(cmd_transcribe(args))
-    elif args.command == "draft":
-        asyncio.run(cmd_draft(args))
-    elif args.command == "drafts":
-        asyncio.run(cmd_drafts(args))
-    elif args.command == "draft-send":
-        asyncio.run(cmd_draft_send(args))
+def _build_serve_parser(serve_p):
+    serve_p.add_argument("--socket", help="Unix socket path (default: <config dir>/tg.sock)")
+
+
+# Subcommand -> function adding its arguments (commands without arguments are absent)
+_BUILDERS = {
+    "setup": _build_setup_parser,
+    "status": _build_status_parser,
+    "list": _build_list_parser,
+    "recent": _build_recent_parser,
+    "search": _build_search_parser,
+    "unread": _build_unread_parser,
+    "thread": _build_thread_parser,
+    "send": _build_send_parser,
+    "edit": _build_edit_parser,
+    "delete": _build_delete_parser,
+    "forward": _build_forward_parser,
+    "mark-read": _build_mark_read_parser,
+    "download": _build_download_parser,
+    "transcribe": _build_transcribe_parser,
+    "draft": _build_draft_parser,
+    "drafts": _build_drafts_parser,
+    "draft-send": _build_draft_send_parser,
+    "serve": _build_serve_parser,
+}
+
+
+def build_parser(command=None):
+    """Build the CLI parser, adding arguments only for `command`.
+
+    Every subcommand is registered so --help and invalid-choice errors list
+    them all, but only the selected one gets its arguments (and its -h).
+    """
+    parser = argparse.ArgumentParser(description="Telegram Telethon CLI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text, add_help=name == command)
+        if name == command and name in _BUILDERS:
+            _BUILDERS[name](sub)
+    return parser
+
+
+def _prefetch():
+    """Import telethon and parse the config ahead of get_client()."""
+    try:
+        import telethon  # noqa: F401
+        get_config()
+    except Exception:
+        pass  # get_client() hits (and reports) the same error itself
+
+
+def _start_prefetch():
+    """Warm telethon's import and the config on a daemon thread.
+
+    Runs alongside event loop setup and the command module imports, so by the
+    time get_client() needs them they are usually already in place.
+    """
+    import threading
+
+    threading.Thread(target=_prefetch, daemon=True).start()
+
+
+def _cmd_setup(args):
+    setup_wizard(
+        api_id=args.api_id,
+        api_hash=args.api_hash,
+        phone=args.phone,
+        code=args.code,
+        password=args.password,
+        use_qr=args.qr,
+    )
+
+
+def _cmd_status(args):
+    show_status(quick=args.quick)
+
+
+def _cmd_daemon_config(args):
+    setup_daemon_config()
+
+
+def _cmd_serve(args):
+    try:
+        run_async(serve(args.socket or default_socket_path()))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+def run_command(args):
+    """Run one of ASYNC_COMMANDS, through a `tg.py serve` process if one is listening."""
+    # TG_SESSION_SOCKET points at a `tg.py serve` socket; without a
+    # listening server the command connects on its own
+    socket_path = os.environ.get("TG_SESSION_SOCKET")
+    if socket_path:
+        forward_command(socket_path, args.command, args)
+    _start_prefetch()
+    run_async(ASYNC_COMMANDS[args.command](args, sys.stdout))
+
+
+# Commands that manage their own event loop (or need none); all others go through run_command
+SYNC_COMMANDS = {
+    "setup": _cmd_setup,
+    "status": _cmd_status,
+    "daemon-config": _cmd_daemon_config,
+    "serve": _cmd_serve,
+}
+
+
+def main():
+    # Phase 1: find the subcommand without building any subcommand's arguments
+    argv = sys.argv[1:]
+    command = build_parser().parse_known_args(argv)[0].command
+    # Phase 2: parse for real with only that subcommand's arguments
+    parser = build_parser(command)
+    args = parser.parse_args(argv)
+
+    SYNC_COMMANDS.get(args.command, run_command)(args)
 
 
 if __name__ == "__main__":
@@ -5,7 +5,9 @@ Controls the background daemon process.
 """
 import asyncio
 import logging
+import os
 import sys
+import time
 from pathlib import Path
 
 # Add src to path for development
@@ -14,7 +16,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 import argparse
 
 from telegram_telethon.core.config import DEFAULT_CONFIG_DIR
-from telegram_telethon.daemon.runner import run_daemon
 
 
 def setup_logging(foreground: bool = False, log_file: Path = None):
@@ -40,6 +41,8 @@ def setup_logging(foreground: bool = False, log_file: Path = None):
 
 def cmd_start(args):
     """Start the daemon."""
+    from telegram_telethon.daemon.runner import run_daemon
+
     log_file = None
     if not args.foreground:
         log_file = DEFAULT_CONFIG_DIR / "daemon.log"
@@ -51,10 +54,31 @@ def cmd_start(args):
         print(f"Logs: {log_file}")
         print("Press Ctrl+C to stop")
 
+    server = socket_path = None
+
+    async def serve_commands(client):
+        """Let tg.py commands (TG_SESSION_SOCKET) reuse the daemon's connection."""
+        nonlocal server, socket_path
+        import tg  # scripts/tg.py, next to this file
+
+        socket_path = args.socket or tg.default_socket_path()
+        server = await tg.start_command_server(client, socket_path)
+        logging.getLogger(__name__).info(f"Serving tg.py commands on {socket_path}")
+
+    async def run():
+        try:
+            await run_daemon(
+                config_dir=DEFAULT_CONFIG_DIR,
+                on_connected=None if args.no_socket else serve_commands,
+            )
+        finally:
+            if server:
+                import tg
+
+                tg.stop_command_server(server, socket_path)
+
     try:
-        asyncio.run(run_daemon(
-            config_dir=DEFAULT_CONFIG_DIR,
-        ))
+        asyncio.run(run())
     except KeyboardInterrupt:
         print("\nStopped.")
 
@@ -66,6 +90,23 @@ def cmd_status(args):
     print("Use 'tg.py status' for connection status")
 
 
+def _last_lines(f, n: int, block_size: int = 8192) -> bytes:
+    """Return the last n lines of binary file f, leaving f positioned at its end."""
+    end = f.seek(0, os.SEEK_END)
+    if n <= 0:
+        return b""
+    pos = end
+    data = b""
+    # n + 1 newlines pin down where the first wanted line starts
+    while pos > 0 and data.count(b"\n") <= n:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        data = f.read(step) + data
+    f.seek(end)
+    return b"".join(data.splitlines(keepends=True)[-n:])
+
+
 def cmd_logs(args):
     """Tail daemon logs."""
     log_file = DEFAULT_CONFIG_DIR / "daemon.log"
@@ -75,9 +116,21 @@ def cmd_logs(args):
         print("Start daemon first with: tgd.py start")
         return
 
-    import subprocess
+    out = sys.stdout.buffer
     try:
-        subprocess.run(["tail", "-f", "-n", str(args.lines), str(log_file)])
+        with open(log_file, "rb") as f:
+            out.write(_last_lines(f, args.lines))
+            out.flush()
+            # Follow like `tail -f`: poll for appended data
+            while True:
+                chunk = f.read()
+                if chunk:
+                    out.write(chunk)
+                    out.flush()
+                    continue
+                if os.stat(log_file).st_size < f.tell():
+                    f.seek(0)  # truncated: start over from the top
+                time.sleep(0.5)
     except KeyboardInterrupt:
         pass
 
@@ -93,6 +146,15 @@ def main():
         action="store_true",
         help="Run in foreground (logs to stdout)"
     )
+    start_parser.add_argument(
+        "--socket",
+        help="Unix socket for tg.py commands (default: <config dir>/tg.sock)"
+    )
+    start_parser.add_argument(
+        "--no-socket",
+        action="store_true",
+        help="Don't accept tg.py commands over a socket"
+    )
     start_parser.set_defaults(func=cmd_start)
 
     # Status
@@ -2,15 +2,27 @@
 
 __version__ = "0.1.0"
 
-from .core.config import Config, DaemonConfig, TriggerConfig, ClaudeConfig
-from .core.auth import AuthWizard, AuthStatus, verify_connection
+# Re-exports are resolved on first access, so importing a submodule such as
+# core.config does not pull in telethon through core.auth.
+_EXPORTS = {
+    "Config": "core.config",
+    "DaemonConfig": "core.config",
+    "TriggerConfig": "core.config",
+    "ClaudeConfig": "core.config",
+    "AuthWizard": "core.auth",
+    "AuthStatus": "core.auth",
+    "verify_connection": "core.auth",
+}
 
-__all__ = [
-    "Config",
-    "DaemonConfig",
-    "TriggerConfig",
-    "ClaudeConfig",
-    "AuthWizard",
-    "AuthStatus",
-    "verify_connection",
-]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
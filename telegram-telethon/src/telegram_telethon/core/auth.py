@@ -12,19 +12,29 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Any
 
-from telethon import TelegramClient
+from telethon import TelegramClient, events
 from telethon.errors import SessionPasswordNeededError
 from telethon.tl.functions.auth import ExportLoginTokenRequest, ImportLoginTokenRequest
-from telethon.tl.types import auth
+from telethon.tl.types import UpdateLoginToken, auth
 
 from .config import Config, DEFAULT_CONFIG_DIR
 
+# Compiled once; the setup prompts re-run the validators on every retry
+_API_HASH_RE = re.compile(r"[0-9a-fA-F]{32}")
+# "+" then at least 7 digits, with whitespace allowed anywhere after the "+"
+_PHONE_RE = re.compile(r"\+(?:\s*\d){7,}\s*")
+
 
 class AuthError(Exception):
     """Authentication error."""
     pass
 
 
+class Auth2FARequired(AuthError):
+    """Sign-in needs the account's 2FA password."""
+    pass
+
+
 @dataclass
 class AuthStatus:
     """Authentication status information."""
@@ -89,6 +99,7 @@ class AuthWizard:
         self.config = Config(config_dir=config_dir)
         self._client: Optional[TelegramClient] = None
         self._phone_code_hash: Optional[str] = None
+        self._qr_scanned: Optional[asyncio.Event] = None
 
     def validate_api_id(self, value: str) -> bool:
         """Validate API ID format."""
@@ -98,17 +109,15 @@ class AuthWizard:
 
     def validate_api_hash(self, value: str) -> bool:
         """Validate API hash format (32 hex characters)."""
-        if not value or len(value) != 32:
+        if not value:
             return False
-        return all(c in "0123456789abcdef" for c in value.lower())
+        return _API_HASH_RE.fullmatch(value) is not None
 
     def validate_phone(self, value: str) -> bool:
         """Validate phone number format."""
-        if not value or not value.startswith("+"):
+        if not value:
             return False
-        # Remove spaces and check length
-        digits = re.sub(r"\s+", "", value[1:])
-        return len(digits) >= 7 and digits.isdigit()
+        return _PHONE_RE.fullmatch(value) is not None
 
     def set_credentials(self, api_id: str, api_hash: str) -> None:
         """Set API credentials."""
@@ -154,7 +163,8 @@ class AuthWizard:
             User object on success
 
         Raises:
-            AuthError: If 2FA is required or sign-in fails
+            Auth2FARequired: If 2FA is required
+            AuthError: If sign-in fails
         """
         if not self._client or not self._phone_code_hash:
             raise AuthError("Must call send_code first")
@@ -169,7 +179,7 @@ class AuthWizard:
             self.config.save()
             return user
         except SessionPasswordNeededError:
-            raise AuthError("2FA required - call sign_in_2fa with password")
+            raise Auth2FARequired("2FA required - call sign_in_2fa with password")
 
     async def sign_in_2fa(self, password: str) -> Any:
         """Complete sign in with 2FA password.
@@ -217,6 +227,11 @@ class AuthWizard:
 
         await self._client.connect()
 
+        # Telegram pushes UpdateLoginToken once the QR is scanned; listen
+        # before the code is shown so the update cannot be missed
+        self._qr_scanned = asyncio.Event()
+        self._client.add_event_handler(self._on_login_token, events.Raw(UpdateLoginToken))
+
         result = await self._client(ExportLoginTokenRequest(
             api_id=self.config.api_id,
             api_hash=self.config.api_hash,
@@ -232,12 +247,17 @@ class AuthWizard:
         else:
             raise AuthError(f"Unexpected response: {type(result)}")
 
-    async def wait_for_qr_login(self, timeout: int = 60, poll_interval: float = 2.0) -> Any:
+    async def _on_login_token(self, update: UpdateLoginToken) -> None:
+        self._qr_scanned.set()
+
+    async def wait_for_qr_login(self, timeout: int = 60) -> Any:
         """Wait for QR code to be scanned.
 
+        Sleeps until Telegram reports the scan, then exports the token once
+        to complete the login.
+
         Args:
             timeout: Maximum seconds to wait
-            poll_interval: Seconds between polls
 
         Returns:
             User object on success
@@ -245,19 +265,30 @@ class AuthWizard:
         Raises:
             AuthError: If timeout or login fails
         """
-        if not self._client:
+        if not self._client or self._qr_scanned is None:
             raise AuthError("Must call start_qr_login first")
 
-        import time
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
 
-        while time.time() - start_time < timeout:
-            try:
-                result = await self._client(ExportLoginTokenRequest(
-                    api_id=self.config.api_id,
-                    api_hash=self.config.api_hash,
-                    except_ids=[],
-                ))
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._qr_scanned.wait(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    raise AuthError(f"Timeout waiting for QR scan after {timeout}s")
+                self._qr_scanned.clear()
+
+                try:
+                    result = await self._client(ExportLoginTokenRequest(
+                        api_id=self.config.api_id,
+                        api_hash=self.config.api_hash,
+                        except_ids=[],
+                    ))
+                except Exception as e:
+                    if "AUTH_TOKEN_EXPIRED" in str(e):
+                        raise AuthError("QR code expired. Please try again.")
+                    raise
 
                 if isinstance(result, auth.LoginTokenSuccess):
                     # QR was scanned successfully
@@ -268,18 +299,12 @@ class AuthWizard:
                 elif isinstance(result, auth.LoginTokenMigrateTo):
                     # Need to reconnect to different DC
                     raise AuthError(f"DC migration required to DC{result.dc_id}")
-                elif isinstance(result, auth.LoginToken):
-                    # Still waiting for scan
-                    await asyncio.sleep(poll_interval)
-                else:
+                elif not isinstance(result, auth.LoginToken):
                     raise AuthError(f"Unexpected response: {type(result)}")
-
-            except Exception as e:
-                if "AUTH_TOKEN_EXPIRED" in str(e):
-                    raise AuthError("QR code expired. Please try again.")
-                raise
-
-        raise AuthError(f"Timeout waiting for QR scan after {timeout}s")
+                # Still a plain LoginToken: the update was not a completed scan
+        finally:
+            self._client.remove_event_handler(self._on_login_token)
+            self._qr_scanned = None
 
 
 async def verify_connection(config_dir: Path = DEFAULT_CONFIG_DIR) -> dict:
@@ -13,15 +13,42 @@ from typing import Optional, List, Any
 
 import yaml
 
+# libyaml's C loader/dumper when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 DEFAULT_CONFIG_DIR = Path.home() / ".config" / "telegram-telethon"
 
+# path -> ((mtime_ns, size), parsed data); lets repeated loads skip the parse
+_YAML_CACHE: dict[Path, tuple[tuple[int, int], dict]] = {}
+
 
 class ConfigError(Exception):
     """Configuration error."""
     pass
 
 
+def _read_yaml(path: Path) -> Optional[dict]:
+    """Parse a YAML config file, reusing the last result while the file is unchanged.
+
+    Returns None if the file does not exist. Callers must not mutate the result.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _YAML_CACHE.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    with open(path) as f:
+        data = yaml.load(f, Loader=_SafeLoader) or {}
+    _YAML_CACHE[path] = (key, data)
+    return data
+
+
 @dataclass
 class Config:
     """Core Telegram API configuration."""
@@ -60,24 +87,22 @@ class Config:
 
         # Write with restricted permissions (owner read/write only)
         with open(path, "w") as f:
-            yaml.dump(data, f, default_flow_style=False)
+            yaml.dump(data, f, Dumper=_SafeDumper, default_flow_style=False)
 
         os.chmod(path, 0o600)
 
     @classmethod
     def load(cls, path: Path) -> Config:
         """Load config from YAML file."""
-        if not path.exists():
+        data = _read_yaml(path)
+        if data is None:
             return cls(config_dir=path.parent)
 
-        with open(path) as f:
-            data = yaml.safe_load(f) or {}
-
         return cls(
             api_id=data.get("api_id"),
             api_hash=data.get("api_hash"),
             phone=data.get("phone"),
-            allowed_send_groups=data.get("allowed_send_groups", []),
+            allowed_send_groups=list(data.get("allowed_send_groups") or []),
             config_dir=path.parent,
         )
 
@@ -114,7 +139,7 @@ class ClaudeConfig:
     def from_dict(cls, data: dict) -> ClaudeConfig:
         """Create from dictionary."""
         return cls(
-            allowed_tools=data.get("allowed_tools", []),
+            allowed_tools=list(data.get("allowed_tools") or []),
             max_turns=data.get("max_turns", 10),
             timeout=data.get("timeout", 300),
         )
@@ -133,6 +158,9 @@ class TriggerConfig:
     system_prompt: Optional[str] = None  # Custom system prompt for claude action
 
     _compiled: Optional[re.Pattern] = field(default=None, repr=False)
+    # Per-message lookups, bound once in __post_init__
+    _match: Any = field(default=None, init=False, repr=False, compare=False)
+    _chat_lower: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Compile regex pattern."""
@@ -140,6 +168,8 @@ class TriggerConfig:
             self._compiled = re.compile(self.pattern)
         except re.error as e:
             raise ConfigError(f"Invalid regex pattern '{self.pattern}': {e}")
+        self._match = self._compiled.match
+        self._chat_lower = None if self.chat == "*" else self.chat.lower()
 
     @property
     def compiled_pattern(self) -> re.Pattern:
@@ -150,13 +180,12 @@ class TriggerConfig:
 
     def matches_chat(self, chat_name: str) -> bool:
         """Check if trigger matches a chat name."""
-        if self.chat == "*":
-            return True
-        return self.chat.lower() == chat_name.lower()
+        chat_lower = self._chat_lower
+        return chat_lower is None or chat_lower == chat_name.lower()
 
     def match_message(self, text: str) -> Optional[re.Match]:
         """Match message text against pattern."""
-        return self.compiled_pattern.match(text)
+        return self._match(text)
 
     @classmethod
     def from_dict(cls, data: dict) -> TriggerConfig:
@@ -186,12 +215,10 @@ class DaemonConfig:
     @classmethod
     def load(cls, path: Path) -> DaemonConfig:
         """Load daemon config from YAML file."""
-        if not path.exists():
+        data = _read_yaml(path)
+        if data is None:
             return cls()
 
-        with open(path) as f:
-            data = yaml.safe_load(f) or {}
-
         triggers = [
             TriggerConfig.from_dict(t)
             for t in data.get("triggers", [])
@@ -243,5 +270,12 @@ class DaemonConfig:
             },
         }
 
+        # Leave the file alone when it already holds exactly this config
+        try:
+            if _read_yaml(path) == data:
+                return
+        except yaml.YAMLError:
+            pass  # unreadable file: overwrite it
+
         with open(path, "w") as f:
-            yaml.dump(data, f, default_flow_style=False)
+            yaml.dump(data, f, Dumper=_SafeDumper, default_flow_style=False)
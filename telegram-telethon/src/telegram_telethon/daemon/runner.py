@@ -7,7 +7,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 from telethon import TelegramClient, events
 
@@ -26,9 +26,11 @@ class Daemon:
         self,
         config_dir: Path = DEFAULT_CONFIG_DIR,
         daemon_config_path: Optional[Path] = None,
+        on_connected: Optional[Callable[[TelegramClient], Awaitable[None]]] = None,
     ):
         self.config_dir = config_dir
         self.daemon_config_path = daemon_config_path or (config_dir / "daemon.yaml")
+        self.on_connected = on_connected
 
         self._client: Optional[TelegramClient] = None
         self._running = False
@@ -80,6 +82,9 @@ class Daemon:
         logger.info(f"Connected as {me.first_name} (@{me.username})")
         logger.info(f"Listening for {len(daemon_config.triggers)} trigger(s)...")
 
+        if self.on_connected:
+            await self.on_connected(self._client)
+
         self._running = True
         await self._client.run_until_disconnected()
 
@@ -203,11 +208,17 @@ class Daemon:
 async def run_daemon(
     config_dir: Path = DEFAULT_CONFIG_DIR,
     daemon_config_path: Optional[Path] = None,
+    on_connected: Optional[Callable[[TelegramClient], Awaitable[None]]] = None,
 ) -> None:
-    """Run the daemon process."""
+    """Run the daemon process.
+
+    on_connected, if given, is awaited with the connected client before the
+    daemon starts listening; tgd.py uses it to share the client with tg.py.
+    """
     daemon = Daemon(
         config_dir=config_dir,
         daemon_config_path=daemon_config_path,
+        on_connected=on_connected,
     )
 
     try:
@@ -154,6 +154,7 @@ async def transcribe_voice(
     message_id: int,
     fallback_method: Optional[str] = "groq",  # "groq", "whisper", None
     groq_api_key: Optional[str] = None,
+    http_client: Optional[Any] = None,
 ) -> TranscriptResult:
     """Transcribe a voice message.
 
@@ -166,6 +167,7 @@ async def transcribe_voice(
         message_id: Message ID of the voice message
         fallback_method: "groq" (Groq Whisper API), "whisper" (local), or None
         groq_api_key: API key for Groq (required if fallback_method="groq")
+        http_client: httpx.AsyncClient to reuse for the Groq request
     """
     entity, resolved_name = await resolve_entity(client, chat_name)
     if entity is None:
@@ -223,15 +225,23 @@ async def transcribe_voice(
             return TranscriptResult(success=False, error="Failed to download voice message")
 
         if fallback_method == "groq":
-            return await _transcribe_with_groq(file_path, groq_api_key)
+            return await _transcribe_with_groq(file_path, groq_api_key, http_client)
         elif fallback_method == "whisper":
             return await _transcribe_with_whisper(file_path)
 
     return TranscriptResult(success=False, error=f"Unknown fallback method: {fallback_method}")
 
 
-async def _transcribe_with_groq(file_path: str, api_key: Optional[str]) -> TranscriptResult:
-    """Transcribe audio using Groq's Whisper API."""
+async def _transcribe_with_groq(
+    file_path: str,
+    api_key: Optional[str],
+    http_client: Optional[Any] = None,
+) -> TranscriptResult:
+    """Transcribe audio using Groq's Whisper API.
+
+    Args:
+        http_client: httpx.AsyncClient to reuse (a temporary one is opened if omitted)
+    """
     if not api_key:
         api_key = os.environ.get("GROQ_API_KEY")
 
@@ -244,28 +254,10 @@ async def _transcribe_with_groq(file_path: str, api_key: Optional[str]) -> Trans
     try:
         import httpx
 
-        async with httpx.AsyncClient() as http_client:
-            with open(file_path, 'rb') as f:
-                response = await http_client.post(
-                    "https://api.groq.com/openai/v1/audio/transcriptions",
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    files={"file": (os.path.basename(file_path), f, "audio/ogg")},
-                    data={"model": "whisper-large-v3"},
-                    timeout=60.0,
-                )
-
-            if response.status_code == 200:
-                data = response.json()
-                return TranscriptResult(
-                    success=True,
-                    text=data.get("text", ""),
-                    method="groq",
-                )
-            else:
-                return TranscriptResult(
-                    success=False,
-                    error=f"Groq API error {response.status_code}: {response.text}"
-                )
+        if http_client is None:
+            async with httpx.AsyncClient() as own_client:
+                return await _post_to_groq(own_client, file_path, api_key)
+        return await _post_to_groq(http_client, file_path, api_key)
     except ImportError:
         return TranscriptResult(
             success=False,
@@ -275,6 +267,42 @@ async def _transcribe_with_groq(file_path: str, api_key: Optional[str]) -> Trans
         return TranscriptResult(success=False, error=f"Groq transcription failed: {e}")
 
 
+async def _post_to_groq(http_client, file_path: str, api_key: str) -> TranscriptResult:
+    """Send one audio file to Groq's transcription endpoint."""
+    with open(file_path, 'rb') as f:
+        response = await http_client.post(
+            "https://api.groq.com/openai/v1/audio/transcriptions",
+            headers={"Authorization": f"Bearer {api_key}"},
+            files={"file": (os.path.basename(file_path), f, "audio/ogg")},
+            data={"model": "whisper-large-v3"},
+            timeout=60.0,
+        )
+
+    if response.status_code == 200:
+        data = response.json()
+        return TranscriptResult(
+            success=True,
+            text=data.get("text", ""),
+            method="groq",
+        )
+    return TranscriptResult(
+        success=False,
+        error=f"Groq API error {response.status_code}: {response.text}"
+    )
+
+
+def _open_http_client(max_connections: int):
+    """Keep-alive httpx client for a run of Groq requests, or None without httpx."""
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return httpx.AsyncClient(limits=httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+    ))
+
+
 async def _transcribe_with_whisper(file_path: str) -> TranscriptResult:
     """Transcribe audio using local Whisper."""
     try:
@@ -319,6 +347,8 @@ async def transcribe_batch(
     limit: int = 10,
     fallback_method: Optional[str] = "groq",
     groq_api_key: Optional[str] = None,
+    concurrency: int = 4,
+    http_client: Optional[Any] = None,
 ) -> List[Dict]:
     """Transcribe multiple voice messages from a chat.
 
@@ -327,27 +357,41 @@ async def transcribe_batch(
         limit: Max messages to transcribe
         fallback_method: Transcription fallback
         groq_api_key: Groq API key
+        concurrency: Max transcriptions running at once
+        http_client: httpx.AsyncClient for Groq requests (one is opened for the
+            batch if omitted, so the requests share keep-alive connections)
     """
     entity, resolved_name = await resolve_entity(client, chat_name)
     if entity is None:
         return [{"error": f"Chat '{chat_name}' not found"}]
 
-    results = []
-    count = 0
-
+    voice_messages = []
     async for msg in client.iter_messages(entity, limit=100):
         if _detect_media_type(msg) != "voice":
             continue
+        voice_messages.append(msg)
+        if len(voice_messages) >= limit:
+            break
 
-        result = await transcribe_voice(
-            client,
-            chat_name,
-            msg.id,
-            fallback_method=fallback_method,
-            groq_api_key=groq_api_key,
-        )
+    # Each transcription is mostly waiting on Telegram or Groq, so run a
+    # bounded number at once instead of one after another
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    last_index = len(voice_messages) - 1
+
+    async def transcribe_one(index: int, msg) -> Dict:
+        async with semaphore:
+            result = await transcribe_voice(
+                client,
+                chat_name,
+                msg.id,
+                fallback_method=fallback_method,
+                groq_api_key=groq_api_key,
+                http_client=http_client,
+            )
+            if index < last_index:
+                await asyncio.sleep(0.5)  # Rate limiting, per concurrent slot
 
-        results.append({
+        return {
             "message_id": msg.id,
             "date": msg.date.isoformat() if msg.date else None,
             "sender": getattr(msg.sender, 'first_name', 'Unknown') if msg.sender else 'Unknown',
@@ -355,15 +399,21 @@ async def transcribe_batch(
             "text": result.text,
             "method": result.method,
             "error": result.error,
-        })
+        }
 
-        count += 1
-        if count >= limit:
-            break
-
-        await asyncio.sleep(0.5)  # Rate limiting
+    owns_http_client = False
+    if http_client is None and fallback_method == "groq" and voice_messages:
+        http_client = _open_http_client(max(1, concurrency))
+        owns_http_client = http_client is not None
 
-    return results
+    try:
+        # gather() keeps results in message order
+        return list(await asyncio.gather(*(
+            transcribe_one(index, msg) for index, msg in enumerate(voice_messages)
+        )))
+    finally:
+        if owns_http_client:
+            await http_client.aclose()
 
 
 async def download_profile_photo(
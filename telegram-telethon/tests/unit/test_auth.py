@@ -6,6 +6,7 @@ from pathlib import Path
 from telegram_telethon.core.auth import (
     AuthWizard,
     AuthError,
+    Auth2FARequired,
     AuthStatus,
     verify_connection,
 )
@@ -125,7 +126,7 @@ class TestAuthWizard:
         wizard._phone_code_hash = "hash123"
         wizard.config.phone = "+1234567890"
 
-        with pytest.raises(AuthError, match="2FA"):
+        with pytest.raises(Auth2FARequired, match="2FA"):
             await wizard.sign_in("12345")
 
     @patch("telegram_telethon.core.auth.TelegramClient")
@@ -142,6 +143,41 @@ class TestAuthWizard:
         assert user.first_name == "Test"
         mock_client.sign_in.assert_called_with(password="mypassword")
 
+    async def test_qr_login_waits_for_update(self, wizard):
+        """wait_for_qr_login exports the token only after the scan update arrives."""
+        import asyncio
+        from telethon.tl.types import auth
+
+        user = MagicMock(first_name="Test")
+        success = auth.LoginTokenSuccess(authorization=MagicMock(user=user))
+        mock_client = MagicMock()
+        mock_client.side_effect = AsyncMock(return_value=success)
+        wizard._client = mock_client
+        wizard._qr_scanned = asyncio.Event()
+        wizard.config.save = MagicMock()
+
+        async def scan():
+            await asyncio.sleep(0.01)
+            mock_client.assert_not_called()
+            await wizard._on_login_token(MagicMock())
+
+        asyncio.create_task(scan())
+        assert await wizard.wait_for_qr_login(timeout=5) is user
+        mock_client.assert_called_once()
+        mock_client.remove_event_handler.assert_called_once_with(wizard._on_login_token)
+
+    async def test_qr_login_timeout(self, wizard):
+        """wait_for_qr_login raises AuthError when no scan arrives in time."""
+        import asyncio
+
+        mock_client = MagicMock()
+        wizard._client = mock_client
+        wizard._qr_scanned = asyncio.Event()
+
+        with pytest.raises(AuthError, match="Timeout"):
+            await wizard.wait_for_qr_login(timeout=0.01)
+        mock_client.assert_not_called()
+
 
 class TestVerifyConnection:
     """Tests for connection verification."""
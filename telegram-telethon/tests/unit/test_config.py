@@ -39,6 +39,18 @@ class TestConfig:
         assert loaded.api_hash == sample_config["api_hash"]
         assert loaded.phone == sample_config["phone"]
 
+    def test_load_sees_rewritten_file(self, temp_config_dir, sample_config):
+        """A repeated load reflects changes to the file, not a stale parse."""
+        config_path = temp_config_dir / "config.yaml"
+        Config(**sample_config).save(config_path)
+        first = Config.load(config_path)
+        first.allowed_send_groups.append("Mutated")
+
+        Config(**{**sample_config, "phone": "+1987654321"}).save(config_path)
+        loaded = Config.load(config_path)
+        assert loaded.phone == "+1987654321"
+        assert loaded.allowed_send_groups == []
+
     def test_is_configured_requires_api_credentials(self, sample_config):
         """is_configured returns True only with api_id and api_hash."""
         config = Config()
@@ -88,6 +100,25 @@ class TestDaemonConfig:
         assert config.claude.max_turns == 10
         assert config.queue_max_concurrent == 1
 
+    def test_save_skips_unchanged_config(self, temp_config_dir, sample_daemon_config):
+        """Saving an unchanged daemon config leaves the file untouched."""
+        config_path = temp_config_dir / "daemon.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump(sample_daemon_config, f)
+        config = DaemonConfig.load(config_path)
+
+        config.save(config_path)
+        written = config_path.read_text()
+        config.save(config_path)
+        assert config_path.read_text() == written
+        config_path.write_text(written + "# marker\n")
+        config.save(config_path)
+        assert config_path.read_text().endswith("# marker\n")
+
+        config.triggers[0].debounce_seconds = 5
+        config.save(config_path)
+        assert DaemonConfig.load(config_path).triggers[0].debounce_seconds == 5
+
     def test_default_daemon_config(self):
         """Default daemon config has sensible defaults."""
         config = DaemonConfig()
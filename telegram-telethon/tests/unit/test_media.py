@@ -324,6 +324,31 @@ class TestTranscribeWithGroq:
         finally:
             os.unlink(temp_path)
 
+    async def test_groq_reuses_given_client(self):
+        """Posts through a caller-provided client without opening or closing one."""
+        from telegram_telethon.modules.media import _transcribe_with_groq
+
+        with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as f:
+            f.write(b"fake audio data")
+            temp_path = f.name
+
+        try:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {"text": "Shared"}
+            shared = AsyncMock()
+            shared.post = AsyncMock(return_value=mock_response)
+
+            with patch('httpx.AsyncClient') as mock_client:
+                result = await _transcribe_with_groq(temp_path, "test_api_key", shared)
+
+            mock_client.assert_not_called()
+            shared.post.assert_awaited_once()
+            shared.aclose.assert_not_awaited()
+            assert result.text == "Shared"
+        finally:
+            os.unlink(temp_path)
+
     async def test_groq_no_api_key(self):
         """Returns error when no API key."""
         from telegram_telethon.modules.media import _transcribe_with_groq
@@ -381,6 +406,82 @@ class TestTranscribeBatch:
         assert result[0]["sender"] == "Alice"
         assert result[1]["sender"] == "Bob"
 
+    async def test_batch_runs_concurrently_in_order(self):
+        """Transcribes up to `concurrency` messages at once, keeping message order."""
+        import asyncio
+
+        client = AsyncMock()
+        entity = MagicMock()
+
+        messages = []
+        for i in range(1, 6):
+            msg = MagicMock()
+            msg.id = i
+            msg.date = None
+            msg.sender = MagicMock(first_name=f"User{i}")
+            messages.append(msg)
+
+        async def mock_iter_messages(*args, **kwargs):
+            for msg in messages:
+                yield msg
+
+        client.iter_messages = mock_iter_messages
+
+        in_flight = 0
+        max_in_flight = 0
+        real_sleep = asyncio.sleep
+
+        async def mock_transcribe(client, chat_name, message_id, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # Later messages finish first
+            await real_sleep(0.01 * (6 - message_id))
+            in_flight -= 1
+            return TranscriptResult(success=True, text=f"text {message_id}", method="groq")
+
+        with patch('telegram_telethon.modules.media.resolve_entity',
+                   return_value=(entity, "Test Chat")):
+            with patch('telegram_telethon.modules.media._detect_media_type',
+                       return_value="voice"):
+                with patch('telegram_telethon.modules.media.transcribe_voice',
+                           side_effect=mock_transcribe):
+                    with patch('asyncio.sleep', new_callable=AsyncMock):
+                        result = await transcribe_batch(client, "Test Chat", limit=4, concurrency=2)
+
+        assert [r["message_id"] for r in result] == [1, 2, 3, 4]
+        assert [r["text"] for r in result] == ["text 1", "text 2", "text 3", "text 4"]
+        assert max_in_flight == 2
+
+    async def test_batch_shares_one_http_client(self):
+        """Opens one HTTP client for all Groq fallbacks in a batch and closes it."""
+        client = AsyncMock()
+        entity = MagicMock()
+
+        messages = [MagicMock(id=i, date=None, sender=None) for i in (1, 2, 3)]
+
+        async def mock_iter_messages(*args, **kwargs):
+            for msg in messages:
+                yield msg
+
+        client.iter_messages = mock_iter_messages
+        shared = AsyncMock()
+        transcribe = AsyncMock(return_value=TranscriptResult(success=True, text="t", method="groq"))
+
+        with patch('telegram_telethon.modules.media.resolve_entity',
+                   return_value=(entity, "Test Chat")):
+            with patch('telegram_telethon.modules.media._detect_media_type',
+                       return_value="voice"):
+                with patch('telegram_telethon.modules.media._open_http_client',
+                           return_value=shared) as open_client:
+                    with patch('telegram_telethon.modules.media.transcribe_voice', transcribe):
+                        with patch('asyncio.sleep', new_callable=AsyncMock):
+                            await transcribe_batch(client, "Test Chat", limit=3)
+
+        open_client.assert_called_once()
+        assert all(call.kwargs["http_client"] is shared for call in transcribe.await_args_list)
+        shared.aclose.assert_awaited_once()
+
 
 class TestDownloadProfilePhoto:
     """Tests for profile photo downloading."""